@@ -16,53 +16,68 @@ Legacy imports (still supported)::
 
 Note: Cython-backed exports require compiled extensions (.so on Linux).
       They are None when the package is imported from an uncompiled source tree.
+      All top-level exports are resolved lazily on first access.
 """
 
 __version__ = "0.4.0"
 __author__  = "gtraines"
 
-# ---------------------------------------------------------------------------
-# Pure-Python video sinks — always importable
-# ---------------------------------------------------------------------------
-from cymbal.video import VideoSink, HeadlessSink, DisplaySink
+import importlib
+import sys
 
 # ---------------------------------------------------------------------------
-# Cython-backed exports — guarded for uncompiled source trees
+# Lazy exports
+#
+# Nothing below is imported until first use, so ``import cymbal`` (and every
+# ``import cymbal.<submodule>``, which imports this package first) does not
+# load the Cython extensions, cv2, or the serial/I2C drivers.  Each name is
+# resolved from its module on first attribute access (PEP 562) and cached in
+# the package namespace.
 # ---------------------------------------------------------------------------
 
-try:
-    from cymbal.controller import CymbalController, GimbalController
-except ImportError:
-    CymbalController = None   # type: ignore[assignment,misc]
-    GimbalController = None   # type: ignore[assignment,misc]
-
-try:
-    from cymbal.gimbals import (
-        GimbalBase,
-        Storm32GimbalAdapter,
-        ServoGimbalAdapter,
-        SimpleBGCGimbalAdapter,
-    )
-except ImportError:
-    GimbalBase = None              # type: ignore[assignment,misc]
-    Storm32GimbalAdapter = None    # type: ignore[assignment,misc]
-    ServoGimbalAdapter = None      # type: ignore[assignment,misc]
-    SimpleBGCGimbalAdapter = None  # type: ignore[assignment,misc]
-
-try:
-    from cymbal.camera_gimbal.storm32_controller import Storm32Controller
-except ImportError:
-    Storm32Controller = None  # type: ignore[assignment,misc]
-
-try:
-    from cymbal.spotlight_gimbal.servo_controller import SpotlightController
-except ImportError:
-    SpotlightController = None  # type: ignore[assignment,misc]
-
-try:
-    from cymbal.sensors.mpu6050 import MPU6050
-except ImportError:
-    MPU6050 = None  # type: ignore[assignment,misc]
+_LAZY_EXPORTS = {
+    # Pure-Python video sinks — always importable
+    "VideoSink":              "cymbal.video",
+    "HeadlessSink":           "cymbal.video",
+    "DisplaySink":            "cymbal.video",
+    # Cython-backed exports — None from an uncompiled source tree
+    "CymbalController":       "cymbal.controller",
+    "GimbalController":       "cymbal.controller",
+    "GimbalBase":             "cymbal.gimbals",
+    "Storm32GimbalAdapter":   "cymbal.gimbals",
+    "ServoGimbalAdapter":     "cymbal.gimbals",
+    "SimpleBGCGimbalAdapter": "cymbal.gimbals",
+    "Storm32Controller":      "cymbal.camera_gimbal.storm32_controller",
+    "SpotlightController":    "cymbal.spotlight_gimbal.servo_controller",
+    "MPU6050":                "cymbal.sensors.mpu6050",
+}
+
+_CYTHON_EXPORTS = frozenset(_LAZY_EXPORTS) - {"VideoSink", "HeadlessSink", "DisplaySink"}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module_name), name)
+    except ImportError:
+        if name not in _CYTHON_EXPORTS:
+            raise
+        value = None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
+# Documentation builds introspect the namespace, so resolve everything eagerly
+if "sphinx" in sys.modules:
+    for _name in _LAZY_EXPORTS:
+        __getattr__(_name)
+    del _name
 
 __all__ = [
     # New API
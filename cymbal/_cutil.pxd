@@ -0,0 +1,11 @@
+"""
+Cython header file for inline C helpers shared by the controller modules
+"""
+
+cdef inline double _clamp(double value, double lo, double hi):
+    """Clamp value to [lo, hi]; compiles to a pair of C compares."""
+    if value < lo:
+        return lo
+    if value > hi:
+        return hi
+    return value
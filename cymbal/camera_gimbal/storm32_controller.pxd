@@ -8,15 +8,36 @@ cdef class Storm32Controller:
     cdef public double timeout
     cdef object serial_conn
     cdef bint _is_connected
+    cdef bint _reconnect_pending
+    cdef double _next_reconnect_at
+    cdef int _fd
+    cdef object _tx_q
+    cdef object _tx_thread
+    cdef object _tx_stop
+    cdef list _tx_errors
+    cdef bytearray _tx_buf
+    cdef object _tx_view
+    cdef int _tx_slot
+    cdef object _mav
     
     cpdef bint connect(self)
+    cdef void _enable_low_latency(self)
     cpdef void disconnect(self)
     cpdef bint is_connected(self)
+    cdef bint _ensure_connected(self, str action)
+    cdef void _on_io_error(self, object error)
+    cdef void _transmit(self, object frame)
+    cdef void _start_writer(self)
+    cdef void _stop_writer(self)
+    cpdef bint flush(self, double timeout=*)
     cpdef bint set_angle(self, double pitch, double roll, double yaw)
     cpdef bint set_speed(self, double pitch_speed, double roll_speed, double yaw_speed)
     cpdef object get_status(self)
     cpdef bint center(self)
-    cdef bytes _build_angle_command(self, double pitch, double roll, double yaw)
-    cdef bytes _build_speed_command(self, double pitch_speed, double roll_speed, double yaw_speed)
+    cdef bytes _pack_mavlink(self, object msg)
+    cdef object _build_angle_command(self, double pitch, double roll, double yaw)
+    cdef object _build_speed_command(self, double pitch_speed, double roll_speed, double yaw_speed)
+    cdef object _pack_native(self, unsigned char command, int a, int b, int c)
     cdef bytes _build_status_request(self)
-    cdef dict _parse_status_response(self, bytes response)
+    cdef object _read_frame(self)
+    cdef dict _parse_status_response(self, bytearray response)
@@ -4,16 +4,154 @@ Storm32bgc Brushless Gimbal Controller
 This module provides an interface to control the Storm32bgc brushless gimbal
 controller via serial communication (UART).
 
-The Storm32bgc uses the MAVLink protocol for communication.
+The Storm32bgc uses the MAVLink protocol for communication.  When pymavlink
+is installed, frames are encoded and decoded by its generated MAVLink v2
+dialect (with CRC and sequence numbers); otherwise a simplified native frame
+format is used.
 """
 
+from cpython.bytearray cimport PyByteArray_AS_STRING
+from cymbal._cutil cimport _clamp
+
+import math
+import os
+import queue
+import select
 import serial
+import threading
 import time
 import logging
 from typing import Optional, Tuple
 
+try:
+    from pymavlink.dialects.v20 import ardupilotmega as mavlink
+except ImportError:
+    mavlink = None
+
 logger = logging.getLogger(__name__)
 
+# MAVLink addressing: this process speaks as the onboard computer and targets
+# the Storm32 gimbal component on the vehicle's system ID.
+cdef int _SOURCE_SYSID = 1
+cdef int _SOURCE_COMPID = 191     # MAV_COMP_ID_ONBOARD_COMPUTER
+cdef int _STORM32_SYSID = 1
+cdef int _STORM32_COMPID = 154    # MAV_COMP_ID_GIMBAL
+
+# Minimum spacing between lazy reconnect attempts after a serial I/O error
+cdef double _RECONNECT_INTERVAL_S = 1.0
+
+# Frames allowed to wait in the TX queue before the link is treated as
+# stalled (~0.3 s of 8-byte frames at 115200 baud)
+cdef int _TX_BACKLOG_MAX = 32
+
+# How often a writer blocked on a full kernel TX buffer checks for shutdown
+cdef double _TX_POLL_S = 0.05
+
+# How long disconnect() waits for queued frames (e.g. a final center) to
+# reach the kernel; a full backlog of MAVLink frames takes ~0.15 s at 115200
+cdef double _DISCONNECT_FLUSH_S = 0.25
+
+
+# MAVLink v2 framing: STX, LEN, INCOMPAT_FLAGS, COMPAT_FLAGS, SEQ, SYSID,
+# COMPID, MSGID (3 bytes) — followed by LEN payload bytes, a 2-byte CRC and,
+# when the signed flag is set, a 13-byte signature.
+cdef int _MAV2_STX = 0xFD
+cdef int _MAV2_HEADER_LEN = 10
+cdef int _MAV2_CRC_LEN = 2
+cdef int _MAV2_SIGNATURE_LEN = 13
+cdef int _MAV2_IFLAG_SIGNED = 0x01
+
+# Simplified Storm32 command frames: 2-byte header + three int16 LE values.
+# Commands are packed in C, in place, into successive slots of a
+# per-controller ring buffer and queued as memoryview slices, so no frame is
+# copied on its way to writev.  The ring holds more slots than can be in
+# flight (a full queue plus one writer batch), so a slot is never reused
+# before it has been written.
+cdef int _COMMAND_LEN = 8
+cdef int _TX_RING_SLOTS = 128
+cdef unsigned char _FRAME_START = 0xFA
+cdef unsigned char _CMD_ANGLE = 0x0E
+cdef unsigned char _CMD_SPEED = 0x0F
+cdef bytes _STATUS_REQ = b'\xFA\x10'
+
+
+cdef inline int _to_int16(double value) except? -32769:
+    """Truncate value to an int16 command field, rejecting NaN and overflow."""
+    # Truncation toward zero maps exactly (-32769, 32768) into int16
+    if not (-32769.0 < value < 32768.0):
+        raise OverflowError(f"command value {value} out of int16 range")
+    return <int>value
+
+
+cdef inline void _pack_command(char* buf, unsigned char command, int a, int b, int c):
+    """Write one native command frame (header + three int16 LE) into buf."""
+    buf[0] = <char>_FRAME_START
+    buf[1] = <char>command
+    buf[2] = <char>(a & 0xFF)
+    buf[3] = <char>((a >> 8) & 0xFF)
+    buf[4] = <char>(b & 0xFF)
+    buf[5] = <char>((b >> 8) & 0xFF)
+    buf[6] = <char>(c & 0xFF)
+    buf[7] = <char>((c >> 8) & 0xFF)
+
+
+def _writer_loop(tx_q, int fd, stop, list errors):
+    """
+    Background UART writer for one connection.
+    
+    Blocks on the queue, then drains everything that accumulated into a
+    single ``os.writev`` so a burst of commands costs one system call.
+    Partial writes are resumed once the (non-blocking) fd is writable.
+    Queued ``threading.Event`` markers are set once the frames ahead of
+    them have been handed to the kernel; ``None`` stops the loop.  A write
+    error is recorded in ``errors`` for the control thread to handle.
+    """
+    cdef Py_ssize_t written
+    cdef int queued
+    cdef list batch, markers
+    
+    while not stop.is_set():
+        item = tx_q.get()
+        batch = []
+        markers = []
+        queued = 0
+        while True:
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                markers.append(item)
+            else:
+                batch.append(item)
+            queued += 1
+            if queued >= _TX_BACKLOG_MAX:
+                break
+            try:
+                item = tx_q.get_nowait()
+            except queue.Empty:
+                break
+        
+        try:
+            while batch:
+                try:
+                    written = os.writev(fd, batch)
+                except BlockingIOError:
+                    written = 0
+                while batch and written >= len(batch[0]):
+                    written -= len(batch[0])
+                    del batch[0]
+                if batch:
+                    if written:
+                        batch[0] = batch[0][written:]
+                    select.select([], [fd], [], _TX_POLL_S)
+                    if stop.is_set():
+                        return
+        except OSError as e:
+            errors.append(e)
+            return
+        finally:
+            for marker in markers:
+                marker.set()
+
 
 cdef class Storm32Controller:
     """
@@ -42,6 +180,21 @@ cdef class Storm32Controller:
         self.timeout = timeout
         self.serial_conn = None
         self._is_connected = False
+        self._reconnect_pending = False
+        self._next_reconnect_at = 0.0
+        self._fd = -1
+        self._tx_q = None
+        self._tx_thread = None
+        self._tx_stop = None
+        self._tx_errors = []
+        self._tx_buf = bytearray(_COMMAND_LEN * _TX_RING_SLOTS)
+        self._tx_view = memoryview(self._tx_buf)
+        self._tx_slot = 0
+        self._mav = None
+        if mavlink is not None:
+            self._mav = mavlink.MAVLink(
+                None, srcSystem=_SOURCE_SYSID, srcComponent=_SOURCE_COMPID
+            )
         
     cpdef bint connect(self):
         """
@@ -50,6 +203,7 @@ cdef class Storm32Controller:
         Returns:
             True if connection successful, False otherwise
         """
+        self._stop_writer()
         try:
             self.serial_conn = serial.Serial(
                 port=self.port,
@@ -60,6 +214,15 @@ cdef class Storm32Controller:
                 stopbits=serial.STOPBITS_ONE
             )
             self._is_connected = True
+            self._reconnect_pending = False
+            try:
+                self._fd = self.serial_conn.fileno()
+            except (AttributeError, OSError, ValueError):
+                # Non-POSIX port objects: stay on pyserial's write()
+                self._fd = -1
+            self._enable_low_latency()
+            if self._fd >= 0:
+                self._start_writer()
             logger.info(f"Connected to Storm32 on {self.port} at {self.baudrate} baud")
             return True
         except serial.SerialException as e:
@@ -67,8 +230,38 @@ cdef class Storm32Controller:
             self._is_connected = False
             return False
     
+    cdef void _enable_low_latency(self):
+        """
+        Ask the kernel to deliver UART bytes immediately.
+        
+        Without ASYNC_LOW_LATENCY the tty layer batches RX into ~10 ms chunks,
+        which dominates status round-trip time.  FTDI USB adapters ignore that
+        flag and use their own latency timer instead, so lower it too when
+        present.  Both are best-effort: failure only costs latency.
+        """
+        try:
+            self.serial_conn.set_low_latency_mode(True)
+            logger.debug(f"ASYNC_LOW_LATENCY enabled on {self.port}")
+        except (AttributeError, NotImplementedError, ValueError, OSError) as e:
+            logger.debug(f"ASYNC_LOW_LATENCY not available on {self.port}: {e}")
+        
+        tty_name = os.path.basename(os.path.realpath(self.port))
+        latency_timer = f"/sys/class/tty/{tty_name}/device/latency_timer"
+        if os.path.exists(latency_timer):
+            try:
+                with open(latency_timer, "w") as f:
+                    f.write("1")
+                logger.debug(f"FTDI latency timer set to 1 ms for {tty_name}")
+            except OSError as e:
+                logger.debug(f"Cannot set FTDI latency timer for {tty_name}: {e}")
+    
     cpdef void disconnect(self):
-        """Close serial connection."""
+        """Close serial connection, first sending any queued commands."""
+        self._reconnect_pending = False
+        if self._tx_thread is not None and not self.flush(_DISCONNECT_FLUSH_S):
+            logger.warning("Storm32 commands still queued at disconnect were dropped")
+        self._stop_writer()
+        self._fd = -1
         if self.serial_conn and self.serial_conn.is_open:
             self.serial_conn.close()
             self._is_connected = False
@@ -78,6 +271,99 @@ cdef class Storm32Controller:
         """Check if controller is connected."""
         return self._is_connected and self.serial_conn and self.serial_conn.is_open
     
+    cdef bint _ensure_connected(self, str action):
+        """
+        Cheap connection guard for the command path.
+        
+        Trusts the cached ``_is_connected`` flag instead of querying the
+        port (pyserial's ``is_open``) on every frame; the flag is cleared by
+        ``_on_io_error`` when a write or read actually fails.  After such a
+        failure a reconnect is attempted lazily, at most once per
+        ``_RECONNECT_INTERVAL_S``.
+        """
+        if self._is_connected:
+            return True
+        if self._reconnect_pending and time.monotonic() >= self._next_reconnect_at:
+            logger.info(f"Reconnecting to Storm32 on {self.port}")
+            if self.connect():
+                return True
+            self._next_reconnect_at = time.monotonic() + _RECONNECT_INTERVAL_S
+        logger.error(f"Cannot {action}: Not connected to Storm32")
+        return False
+    
+    cdef void _on_io_error(self, object error):
+        """Mark the link down after a serial failure and schedule a reconnect."""
+        logger.error(f"Storm32 serial I/O error: {error}")
+        self._is_connected = False
+        self._reconnect_pending = True
+        self._next_reconnect_at = 0.0
+        self._stop_writer()
+        self._fd = -1
+        try:
+            self.serial_conn.close()
+        except Exception:
+            pass
+    
+    cdef void _start_writer(self):
+        """Start the background writer for the current fd."""
+        self._tx_q = queue.SimpleQueue()
+        self._tx_stop = threading.Event()
+        self._tx_errors = []
+        self._tx_thread = threading.Thread(
+            target=_writer_loop,
+            args=(self._tx_q, self._fd, self._tx_stop, self._tx_errors),
+            name=f"storm32-tx-{self.port}",
+            daemon=True,
+        )
+        self._tx_thread.start()
+    
+    cdef void _stop_writer(self):
+        """Stop the background writer, discarding frames not yet written."""
+        if self._tx_thread is None:
+            return
+        self._tx_stop.set()
+        self._tx_q.put(None)
+        self._tx_thread.join(1.0)
+        self._tx_thread = None
+        self._tx_q = None
+    
+    cdef void _transmit(self, object frame):
+        """
+        Queue one frame on the UART without blocking the control loop.
+        
+        Frames are handed to the background writer, which batches them
+        into ``os.writev`` calls on the port's non-blocking fd, so the
+        caller never waits for UART transmission.  Without a usable fd the
+        frame goes through ``Serial.write`` directly.
+        """
+        if self._fd < 0:
+            self.serial_conn.write(frame)
+            return
+        
+        if self._tx_errors:
+            raise self._tx_errors[0]
+        if self._tx_q.qsize() >= _TX_BACKLOG_MAX:
+            raise serial.SerialException("Storm32 TX stalled")
+        self._tx_q.put_nowait(frame)
+    
+    cpdef bint flush(self, double timeout=1.0):
+        """
+        Wait until every queued frame has been handed to the kernel.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            True if the queue drained in time, False otherwise
+        """
+        if self._tx_thread is None:
+            return self._is_connected
+        if self._tx_errors or not self._tx_thread.is_alive():
+            return False
+        done = threading.Event()
+        self._tx_q.put_nowait(done)
+        return done.wait(timeout) and not self._tx_errors
+    
     cpdef bint set_angle(self, double pitch, double roll, double yaw):
         """
         Set gimbal angles.
@@ -90,32 +376,24 @@ cdef class Storm32Controller:
         Returns:
             True if command sent successfully, False otherwise
         """
-        if not self.is_connected():
-            logger.error("Cannot set angle: Not connected to Storm32")
+        if not self._ensure_connected("set angle"):
             return False
         
         try:
             # Clamp values to valid ranges
-            if pitch < -90:
-                pitch = -90
-            elif pitch > 90:
-                pitch = 90
-                
-            if roll < -90:
-                roll = -90
-            elif roll > 90:
-                roll = 90
-                
-            if yaw < -180:
-                yaw = -180
-            elif yaw > 180:
-                yaw = 180
+            pitch = _clamp(pitch, -90, 90)
+            roll = _clamp(roll, -90, 90)
+            yaw = _clamp(yaw, -180, 180)
             
             # Storm32 MAVLink command format (simplified)
             command = self._build_angle_command(pitch, roll, yaw)
-            self.serial_conn.write(command)
-            logger.debug(f"Set angles - Pitch: {pitch}, Roll: {roll}, Yaw: {yaw}")
+            self._transmit(command)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Set angles - Pitch: %s, Roll: %s, Yaw: %s", pitch, roll, yaw)
             return True
+        except (serial.SerialException, OSError) as e:
+            self._on_io_error(e)
+            return False
         except Exception as e:
             logger.error(f"Failed to set angle: {e}")
             return False
@@ -132,15 +410,21 @@ cdef class Storm32Controller:
         Returns:
             True if command sent successfully, False otherwise
         """
-        if not self.is_connected():
-            logger.error("Cannot set speed: Not connected to Storm32")
+        if not self._ensure_connected("set speed"):
             return False
         
         try:
             command = self._build_speed_command(pitch_speed, roll_speed, yaw_speed)
-            self.serial_conn.write(command)
-            logger.debug(f"Set speeds - Pitch: {pitch_speed}, Roll: {roll_speed}, Yaw: {yaw_speed}")
+            self._transmit(command)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Set speeds - Pitch: %s, Roll: %s, Yaw: %s",
+                    pitch_speed, roll_speed, yaw_speed,
+                )
             return True
+        except (serial.SerialException, OSError) as e:
+            self._on_io_error(e)
+            return False
         except Exception as e:
             logger.error(f"Failed to set speed: {e}")
             return False
@@ -152,18 +436,31 @@ cdef class Storm32Controller:
         Returns:
             Dictionary with status information or None if failed
         """
-        if not self.is_connected():
-            logger.error("Cannot get status: Not connected to Storm32")
+        if not self._ensure_connected("get status"):
             return None
         
         try:
-            # Request status
-            self.serial_conn.write(self._build_status_request())
-            time.sleep(0.1)  # Wait for response
-            
-            if self.serial_conn.in_waiting > 0:
-                response = self.serial_conn.read(self.serial_conn.in_waiting)
-                return self._parse_status_response(response)
+            # Drop stale RX (e.g. heartbeats buffered since connect), then
+            # request status.  The request is queued behind any pending
+            # commands, so frames stay in order.  The gimbal interleaves
+            # HEARTBEATs and a COMMAND_ACK with the reply, so frames are read
+            # until MOUNT_STATUS arrives; each read blocks only until its frame
+            # is complete (bounded by the serial timeout).
+            self.serial_conn.reset_input_buffer()
+            self._transmit(self._build_status_request())
+            deadline = time.monotonic() + self.timeout
+            while True:
+                response = self._read_frame()
+                if response is None:
+                    return None
+                status = self._parse_status_response(response)
+                if status is not None:
+                    return status
+                if time.monotonic() >= deadline:
+                    logger.warning("No MOUNT_STATUS from Storm32 before timeout")
+                    return None
+        except (serial.SerialException, OSError) as e:
+            self._on_io_error(e)
             return None
         except Exception as e:
             logger.error(f"Failed to get status: {e}")
@@ -178,42 +475,142 @@ cdef class Storm32Controller:
         """
         return self.set_angle(0, 0, 0)
     
-    cdef bytes _build_angle_command(self, double pitch, double roll, double yaw):
+    cdef bytes _pack_mavlink(self, object msg):
+        """Serialise a pymavlink message and advance the sequence number."""
+        buf = msg.pack(self._mav)
+        self._mav.seq = (self._mav.seq + 1) % 256
+        return buf
+    
+    cdef object _build_angle_command(self, double pitch, double roll, double yaw):
         """
         Build MAVLink command for setting angles.
         
-        In a real implementation, this would use proper MAVLink message encoding
-        with checksums and proper message IDs.
+        Encodes MOUNT_CONTROL (centidegrees) via pymavlink when available,
+        falling back to the simplified native frame.  The native frame is
+        packed into the next transmit ring slot and returned as a
+        memoryview of it.
         """
-        cdef int pitch_int = int(pitch * 100)
-        cdef int roll_int = int(roll * 100)
-        cdef int yaw_int = int(yaw * 100)
+        cdef int pitch_int = _to_int16(pitch * 100)
+        cdef int roll_int = _to_int16(roll * 100)
+        cdef int yaw_int = _to_int16(yaw * 100)
+        
+        if self._mav is not None:
+            return self._pack_mavlink(self._mav.mount_control_encode(
+                _STORM32_SYSID, _STORM32_COMPID,
+                pitch_int, roll_int, yaw_int, 0
+            ))
         
         # Simplified command format
-        command = bytearray([0xFA, 0x0E])  # Header
-        command.extend(pitch_int.to_bytes(2, 'little', signed=True))
-        command.extend(roll_int.to_bytes(2, 'little', signed=True))
-        command.extend(yaw_int.to_bytes(2, 'little', signed=True))
-        return bytes(command)
-    
-    cdef bytes _build_speed_command(self, double pitch_speed, double roll_speed, double yaw_speed):
-        """Build MAVLink command for setting rotation speeds."""
-        cdef int speed_p = int(pitch_speed * 10)
-        cdef int speed_r = int(roll_speed * 10)
-        cdef int speed_y = int(yaw_speed * 10)
-        
-        command = bytearray([0xFA, 0x0F])  # Header
-        command.extend(speed_p.to_bytes(2, 'little', signed=True))
-        command.extend(speed_r.to_bytes(2, 'little', signed=True))
-        command.extend(speed_y.to_bytes(2, 'little', signed=True))
-        return bytes(command)
+        return self._pack_native(_CMD_ANGLE, pitch_int, roll_int, yaw_int)
+    
+    cdef object _build_speed_command(self, double pitch_speed, double roll_speed, double yaw_speed):
+        """
+        Build MAVLink command for setting rotation speeds.
+        
+        Encodes GIMBAL_DEVICE_SET_ATTITUDE with a NaN (ignored) quaternion and
+        angular velocities in rad/s via pymavlink when available, falling back
+        to the simplified native frame (a transmit ring slot, as above).
+        """
+        cdef int speed_p, speed_r, speed_y
+        
+        if self._mav is not None:
+            return self._pack_mavlink(self._mav.gimbal_device_set_attitude_encode(
+                _STORM32_SYSID, _STORM32_COMPID, 0,
+                [math.nan, math.nan, math.nan, math.nan],
+                math.radians(roll_speed),
+                math.radians(pitch_speed),
+                math.radians(yaw_speed),
+            ))
+        
+        speed_p = _to_int16(pitch_speed * 10)
+        speed_r = _to_int16(roll_speed * 10)
+        speed_y = _to_int16(yaw_speed * 10)
+        return self._pack_native(_CMD_SPEED, speed_p, speed_r, speed_y)
+    
+    cdef object _pack_native(self, unsigned char command, int a, int b, int c):
+        """Pack a native frame into the next ring slot and return a view of it."""
+        cdef Py_ssize_t offset = self._tx_slot * _COMMAND_LEN
+        
+        self._tx_slot = (self._tx_slot + 1) % _TX_RING_SLOTS
+        _pack_command(PyByteArray_AS_STRING(self._tx_buf) + offset, command, a, b, c)
+        return self._tx_view[offset:offset + _COMMAND_LEN]
     
     cdef bytes _build_status_request(self):
         """Build MAVLink status request command."""
-        return bytes([0xFA, 0x10])  # Header for status request
+        if self._mav is not None:
+            return self._pack_mavlink(self._mav.command_long_encode(
+                _STORM32_SYSID, _STORM32_COMPID,
+                mavlink.MAV_CMD_REQUEST_MESSAGE, 0,
+                mavlink.MAVLINK_MSG_ID_MOUNT_STATUS, 0, 0, 0, 0, 0, 0
+            ))
+        return _STATUS_REQ
+    
+    cdef object _read_frame(self):
+        """
+        Read one MAVLink v2 frame from the serial port.
+        
+        Reads the fixed-size header first, then exactly LEN payload bytes plus
+        CRC (and signature when signed), so the call returns as soon as the
+        frame is complete instead of after a fixed delay.
+        
+        Returns:
+            Complete frame as a bytearray (the type pymavlink's decoder
+            works on), or None on timeout or missing start byte
+        """
+        cdef int start, remaining
+        
+        header = self.serial_conn.read(_MAV2_HEADER_LEN)
+        
+        # Resynchronise on the start byte if stale bytes preceded the reply
+        start = header.find(_MAV2_STX)
+        if start < 0:
+            logger.warning("Storm32 status reply missing or unframed")
+            return None
+        if start > 0:
+            header = header[start:] + self.serial_conn.read(start)
+        if len(header) < _MAV2_HEADER_LEN:
+            logger.warning("Storm32 status reply truncated in header")
+            return None
+        
+        remaining = header[1] + _MAV2_CRC_LEN
+        if header[2] & _MAV2_IFLAG_SIGNED:
+            remaining += _MAV2_SIGNATURE_LEN
+        
+        body = self.serial_conn.read(remaining)
+        if len(body) < remaining:
+            logger.warning("Storm32 status reply truncated in payload")
+            return None
+        frame = bytearray(header)
+        frame += body
+        return frame
     
-    cdef dict _parse_status_response(self, bytes response):
-        """Parse status response from Storm32."""
+    cdef dict _parse_status_response(self, bytearray response):
+        """
+        Parse status response from Storm32.
+        
+        With pymavlink the frame's CRC is verified and a MOUNT_STATUS reply is
+        decoded into angles; any other frame yields None so the caller keeps
+        reading.  Without pymavlink a placeholder status is returned.
+        """
+        if self._mav is not None:
+            try:
+                msg = self._mav.decode(response)
+            except mavlink.MAVError as e:
+                logger.warning(f"Invalid Storm32 status frame: {e}")
+                return None
+            if msg.get_type() != "MOUNT_STATUS":
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Skipping Storm32 %s while awaiting MOUNT_STATUS",
+                                 msg.get_type())
+                return None
+            return {
+                "connected": True,
+                "pitch": msg.pointing_a / 100.0,
+                "roll": msg.pointing_b / 100.0,
+                "yaw": msg.pointing_c / 100.0,
+                "status": "OK"
+            }
+        
         # Placeholder implementation
         return {
             "connected": True,
@@ -6,7 +6,12 @@ import json
 import logging
 import os
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +23,13 @@ class CameraGimbalConfig:
     baudrate: int = 115200
     timeout: float = 1.0
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "serial_port": self.serial_port,
+            "baudrate": self.baudrate,
+            "timeout": self.timeout,
+        }
+
 
 @dataclass
 class SpotlightGimbalConfig:
@@ -28,6 +40,15 @@ class SpotlightGimbalConfig:
     i2c_bus: int = 1
     use_stabilization: bool = True
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pitch_pin": self.pitch_pin,
+            "yaw_pin": self.yaw_pin,
+            "i2c_address": self.i2c_address,
+            "i2c_bus": self.i2c_bus,
+            "use_stabilization": self.use_stabilization,
+        }
+
 
 @dataclass
 class GPSConfig:
@@ -39,6 +60,16 @@ class GPSConfig:
     use_terrain_db: bool = True
     min_fix_quality: int = 1
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "port": self.port,
+            "baudrate": self.baudrate,
+            "update_rate_hz": self.update_rate_hz,
+            "terrain_db_path": self.terrain_db_path,
+            "use_terrain_db": self.use_terrain_db,
+            "min_fix_quality": self.min_fix_quality,
+        }
+
 
 @dataclass
 class GeoConfig:
@@ -47,6 +78,13 @@ class GeoConfig:
     search_radius_deg: float = 0.01
     enabled: bool = True
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "address_db_path": self.address_db_path,
+            "search_radius_deg": self.search_radius_deg,
+            "enabled": self.enabled,
+        }
+
 
 @dataclass
 class OSDConfig:
@@ -66,6 +104,24 @@ class OSDConfig:
     heading_tape_fov_deg: float = 30.0
     local_timezone: str = "America/Phoenix"
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "font_scale": self.font_scale,
+            "font_thickness": self.font_thickness,
+            "text_color": list(self.text_color),
+            "background_color": list(self.background_color),
+            "background_alpha": self.background_alpha,
+            "show_sbus_channels": self.show_sbus_channels,
+            "show_compass": self.show_compass,
+            "compass_radius": self.compass_radius,
+            "show_heading_tape": self.show_heading_tape,
+            "heading_tape_height_pct": self.heading_tape_height_pct,
+            "heading_tape_width_pct": self.heading_tape_width_pct,
+            "heading_tape_fov_deg": self.heading_tape_fov_deg,
+            "local_timezone": self.local_timezone,
+        }
+
 
 @dataclass
 class SBUSConfig:
@@ -76,6 +132,15 @@ class SBUSConfig:
     frame_timeout_ms: int = 100
     enabled: bool = True
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "gpio_pin": self.gpio_pin,
+            "socket_path": self.socket_path,
+            "failsafe_action": self.failsafe_action,
+            "frame_timeout_ms": self.frame_timeout_ms,
+            "enabled": self.enabled,
+        }
+
 
 @dataclass
 class TelemetryConfig:
@@ -104,6 +169,13 @@ class TelemetryConfig:
     socket_path: str = "/run/cymbal/telemetry.sock"
     frame_timeout_ms: int = 500
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "socket_path": self.socket_path,
+            "frame_timeout_ms": self.frame_timeout_ms,
+        }
+
 
 @dataclass
 class ChannelMapConfig:
@@ -119,6 +191,20 @@ class ChannelMapConfig:
     spotlight_pitch_range: List[float] = field(default_factory=lambda: [-90.0, 30.0])
     spotlight_yaw_range: List[float] = field(default_factory=lambda: [-180.0, 180.0])
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "camera_pitch": self.camera_pitch,
+            "camera_yaw": self.camera_yaw,
+            "spotlight_pitch": self.spotlight_pitch,
+            "spotlight_yaw": self.spotlight_yaw,
+            "mode_select": self.mode_select,
+            "poi_lock": self.poi_lock,
+            "camera_pitch_range": list(self.camera_pitch_range),
+            "camera_yaw_range": list(self.camera_yaw_range),
+            "spotlight_pitch_range": list(self.spotlight_pitch_range),
+            "spotlight_yaw_range": list(self.spotlight_yaw_range),
+        }
+
 
 # ---------------------------------------------------------------------------
 # New modular gimbal model
@@ -403,16 +489,16 @@ class SystemConfig:
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary (new schema, includes gimbals list)."""
         return {
-            'camera_gimbal':  asdict(self.camera_gimbal),
-            'spotlight_gimbal': asdict(self.spotlight_gimbal),
+            'camera_gimbal':  self.camera_gimbal.to_dict(),
+            'spotlight_gimbal': self.spotlight_gimbal.to_dict(),
             'gimbals':        [g.to_dict() for g in self.gimbals],
             'video':          self.video.to_dict(),
-            'gps':            asdict(self.gps),
-            'geo':            asdict(self.geo),
-            'osd':            asdict(self.osd),
-            'sbus':           asdict(self.sbus),
-            'telemetry':      asdict(self.telemetry),
-            'channel_map':    asdict(self.channel_map),
+            'gps':            self.gps.to_dict(),
+            'geo':            self.geo.to_dict(),
+            'osd':            self.osd.to_dict(),
+            'sbus':           self.sbus.to_dict(),
+            'telemetry':      self.telemetry.to_dict(),
+            'channel_map':    self.channel_map.to_dict(),
             'log_level':      self.log_level,
         }
 
@@ -433,12 +519,21 @@ class SystemConfig:
             )
             return default
 
-        with open(config_path, 'r') as f:
-            config_dict = json.load(f)
+        if orjson is not None:
+            with open(config_path, 'rb') as f:
+                config_dict = orjson.loads(f.read())
+        else:
+            with open(config_path, 'r') as f:
+                config_dict = json.load(f)
 
         return cls.from_dict(config_dict)
 
     def save(self, config_path: str) -> None:
         """Save configuration to JSON file."""
+        if orjson is not None:
+            with open(config_path, 'wb') as f:
+                f.write(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+            return
+
         with open(config_path, 'w') as f:
             json.dump(self.to_dict(), f, indent=2)
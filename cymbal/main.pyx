@@ -17,34 +17,38 @@ Backward-compatibility:
     does ``from cymbal.main import GimbalController`` continues to work.
 """
 
+import argparse
 import logging
 import signal
 import sys
 
-# cimport declarations give Cython compile-time type information so that
-# direct method calls on ctrl (initialize, run, shutdown, center_all) are
-# dispatched at the C level rather than through the Python object protocol.
-from cymbal.controller.cymbal_controller cimport CymbalController
-from cymbal.gimbals.storm32_adapter cimport Storm32GimbalAdapter
-from cymbal.gimbals.servo_adapter cimport ServoGimbalAdapter
+# Only the standard library is imported at module level.  The controller,
+# gimbal adapters, sensors and config are imported where they are used, so
+# ``cymbal --help`` / ``--version`` return without loading the extension
+# stack; the only cost is one attribute lookup per call on the few
+# once-per-process lifecycle methods.
 
-# Runtime Python imports — required for construction and re-export.
-# SimpleBGCGimbalAdapter remains a dynamic (try/except) import because the
-# simplebgc_stub extension is optional and may not be compiled on all targets.
-from cymbal.controller.cymbal_controller import CymbalController, GimbalController  # noqa: F401
-from cymbal.controller.telemetry_provider import InProcessTelemetryProvider as _InProcessPy
-from cymbal.config.config import SystemConfig
-from cymbal.gimbals.storm32_adapter import Storm32GimbalAdapter as _Storm32Py
-from cymbal.gimbals.servo_adapter import ServoGimbalAdapter as _ServoPy
+_DEFAULT_CONFIG_PATH = "/etc/cymbal/config.json"
 
 
-def _build_gimbals_from_config(config: SystemConfig) -> list:
+def __getattr__(name):
+    """Resolve the re-exported controller names on first access (PEP 562)."""
+    if name in ("CymbalController", "GimbalController"):
+        from cymbal.controller import cymbal_controller
+        return getattr(cymbal_controller, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _build_gimbals_from_config(config: "SystemConfig") -> list:
     """
     Instantiate GimbalBase objects from ``config.gimbals``.
 
     Falls back to the legacy camera_gimbal / spotlight_gimbal fields when
     the gimbals list is empty (old JSON files).
     """
+    from cymbal.gimbals.storm32_adapter import Storm32GimbalAdapter as _Storm32Py
+    from cymbal.gimbals.servo_adapter import ServoGimbalAdapter as _ServoPy
+
     gimbals = []
 
     if config.gimbals:
@@ -155,6 +159,9 @@ def _build_telemetry_provider(config, logger):
             )
 
     # Default / fallback: in-process provider
+    from cymbal.controller.telemetry_provider import (
+        InProcessTelemetryProvider as _InProcessPy,
+    )
     logger.info("TelemetryProvider: in-process mode (GPS serial in control loop)")
     return _InProcessPy(
         gps_config          = config.gps,
@@ -163,18 +170,36 @@ def _build_telemetry_provider(config, logger):
     )
 
 
-def main():
+def _parse_args(argv):
+    """Parse the command line; ``--help`` and ``--version`` exit here."""
+    from cymbal import __version__
+
+    parser = argparse.ArgumentParser(
+        prog="cymbal",
+        description="Control software for dual gimbals on fixed-wing drones.",
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """
     Main entry point for the Cymbal control application.
 
     Process-level concerns handled here:
+      - Command-line parsing (before any extension module is loaded)
       - logging.basicConfig() with optional file handler
       - Signal handler registration (Ctrl+C / SIGTERM)
       - Config loading → provider selection → gimbal construction → controller startup
     """
-    cdef CymbalController ctrl
+    _parse_args(argv)
+
+    from cymbal.config.config import SystemConfig
+    from cymbal.controller.cymbal_controller import CymbalController
 
-    config = SystemConfig.load("/etc/cymbal/config.json")
+    config = SystemConfig.load(_DEFAULT_CONFIG_PATH)
 
     # --- Logging ---
     log_level = getattr(logging, config.log_level.upper(), logging.INFO)
@@ -194,7 +219,7 @@ def main():
     # --- Gimbals ---
     gimbals = _build_gimbals_from_config(config)
 
-    # --- Controller (typed so lifecycle calls dispatch at the C level) ---
+    # --- Controller ---
     ctrl = CymbalController(
         gimbals,
         config,
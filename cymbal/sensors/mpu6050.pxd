@@ -28,9 +28,11 @@ cdef class MPU6050:
     cpdef bint initialize(self)
     cpdef bint is_initialized(self)
     cdef int read_raw_data(self, int register)
+    cdef int _read_acceleration(self, double* x, double* y, double* z) except -1
     cpdef tuple get_acceleration(self)
     cpdef tuple get_gyroscope(self)
     cpdef double get_temperature(self)
     cpdef bint calibrate(self, int samples=*)
+    cdef int _read_orientation(self, double* pitch, double* roll) except -1
     cpdef tuple get_orientation(self)
     cpdef void close(self)
@@ -135,16 +135,15 @@ cdef class MPU6050:
         
         return value
     
-    cpdef tuple get_acceleration(self):
+    cdef int _read_acceleration(self, double* x, double* y, double* z) except -1:
         """
-        Get acceleration values in g (gravity units).
+        Read calibrated acceleration in g into caller-provided doubles.
         
-        Returns:
-            Tuple of (x, y, z) acceleration in g
+        C-level variant of get_acceleration() for control loops: no tuple
+        is allocated.
         """
         cdef int accel_x, accel_y, accel_z
         cdef double accel_scale = 16384.0
-        cdef double x, y, z
         
         if not self.is_initialized():
             raise RuntimeError("MPU6050 not initialized")
@@ -155,10 +154,21 @@ cdef class MPU6050:
         accel_z = self.read_raw_data(self.ACCEL_ZOUT_H)
         
         # Convert to g (for ±2g range: sensitivity = 16384 LSB/g)
-        x = (accel_x / accel_scale) - self.accel_offset['x']
-        y = (accel_y / accel_scale) - self.accel_offset['y']
-        z = (accel_z / accel_scale) - self.accel_offset['z']
+        x[0] = (accel_x / accel_scale) - self.accel_offset['x']
+        y[0] = (accel_y / accel_scale) - self.accel_offset['y']
+        z[0] = (accel_z / accel_scale) - self.accel_offset['z']
+        return 0
+    
+    cpdef tuple get_acceleration(self):
+        """
+        Get acceleration values in g (gravity units).
+        
+        Returns:
+            Tuple of (x, y, z) acceleration in g
+        """
+        cdef double x, y, z
         
+        self._read_acceleration(&x, &y, &z)
         return (x, y, z)
     
     cpdef tuple get_gyroscope(self):
@@ -267,6 +277,23 @@ cdef class MPU6050:
             logger.error(f"Calibration failed: {e}")
             return False
     
+    cdef int _read_orientation(self, double* pitch, double* roll) except -1:
+        """
+        Calculate pitch and roll in degrees into caller-provided doubles.
+        
+        C-level variant of get_orientation() for control loops: the sample
+        stays in C doubles from the I2C read to the caller, with no
+        intermediate tuples.
+        """
+        cdef double accel_x, accel_y, accel_z
+        
+        self._read_acceleration(&accel_x, &accel_y, &accel_z)
+        
+        # Calculate pitch and roll using C math functions
+        pitch[0] = atan2(accel_y, sqrt(accel_x * accel_x + accel_z * accel_z)) * 180.0 / M_PI
+        roll[0] = atan2(-accel_x, accel_z) * 180.0 / M_PI
+        return 0
+    
     cpdef tuple get_orientation(self):
         """
         Calculate pitch and roll angles from accelerometer.
@@ -274,15 +301,9 @@ cdef class MPU6050:
         Returns:
             Tuple of (pitch, roll) in degrees
         """
-        cdef double accel_x, accel_y, accel_z
         cdef double pitch, roll
         
-        accel_x, accel_y, accel_z = self.get_acceleration()
-        
-        # Calculate pitch and roll using C math functions
-        pitch = atan2(accel_y, sqrt(accel_x**2 + accel_z**2)) * 180.0 / M_PI
-        roll = atan2(-accel_x, accel_z) * 180.0 / M_PI
-        
+        self._read_orientation(&pitch, &roll)
         return (pitch, roll)
     
     cpdef void close(self):
@@ -4,6 +4,10 @@ Cython header file for SpotlightController
 
 from cymbal.sensors.mpu6050 cimport MPU6050
 
+ctypedef struct _PIDState:
+    double integral
+    double prev_error
+
 cdef class SpotlightController:
     cdef readonly int SERVO_MIN_PULSE
     cdef readonly int SERVO_MAX_PULSE
@@ -22,6 +26,21 @@ cdef class SpotlightController:
     cdef public int pitch_pwm
     cdef public int yaw_pwm
     
+    cdef double _pitch_scale
+    cdef double _pitch_offset
+    cdef double _yaw_scale
+    cdef double _yaw_offset
+    cdef bint _use_hw_pwm
+    cdef int _last_pitch_pulse
+    cdef int _last_yaw_pulse
+    
+    cdef public double kp
+    cdef public double ki
+    cdef public double kd
+    cdef _PIDState _pid_pitch
+    cdef _PIDState _pid_yaw
+    cdef double _last_stabilize
+    
     cpdef bint initialize(self)
     cpdef bint is_initialized(self)
     cpdef bint set_position(self, double pitch, double yaw)
@@ -30,5 +49,8 @@ cdef class SpotlightController:
     cpdef bint center(self)
     cpdef object get_orientation(self)
     cpdef bint stabilize(self)
-    cdef int _angle_to_pulse(self, double angle, double min_angle, double max_angle)
+    cdef void _reset_pid(self)
+    cdef bint _apply_position(self, double pitch, double yaw)
+    cdef int _angle_to_pulse(self, double angle, double scale, double offset)
+    cdef void _write_pulses(self, int pitch_pulse, int yaw_pulse)
     cpdef void close(self)
@@ -5,6 +5,8 @@ Controls a 2-axis spotlight gimbal using 360-degree continuous rotation servos
 with MPU6050 IMU for stabilization.
 """
 
+from libc.math cimport lround, isnan
+from cymbal._cutil cimport _clamp
 import time
 import logging
 from typing import Optional, Tuple
@@ -18,6 +20,41 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Hardware PWM: 50 Hz carrier with duty cycle in millionths of the 20 ms frame
+cdef int _SERVO_FRAME_US = 20000
+cdef int _SERVO_FREQ_HZ = 50
+cdef int _HW_PWM_DUTY_PER_US = 1000000 // _SERVO_FRAME_US
+
+# Stabilization PID: integral windup limit (degree-seconds) and the longest
+# gap between updates treated as one continuous loop
+cdef double _PID_INTEGRAL_LIMIT = 90.0
+cdef double _PID_MAX_DT = 0.5
+
+
+cdef inline int _hw_pwm_channel(int gpio):
+    """Return the BCM2835 PWM channel routed to gpio, or -1 if none."""
+    if gpio == 12 or gpio == 18:
+        return 0
+    if gpio == 13 or gpio == 19:
+        return 1
+    return -1
+
+
+cdef inline double _pid_step(_PIDState* state, double error, double kp,
+                             double ki, double kd, double dt):
+    """
+    Advance one PID axis by dt seconds and return its correction.
+
+    A dt of zero (first sample) yields a purely proportional correction.
+    """
+    cdef double derivative = 0.0
+    if dt > 0.0:
+        state.integral = _clamp(state.integral + error * dt,
+                                -_PID_INTEGRAL_LIMIT, _PID_INTEGRAL_LIMIT)
+        derivative = (error - state.prev_error) / dt
+    state.prev_error = error
+    return kp * error + ki * state.integral + kd * derivative
+
 
 cdef class SpotlightController:
     """
@@ -33,7 +70,10 @@ cdef class SpotlightController:
         int yaw_pin = 27,
         int i2c_address = 0x68,
         int i2c_bus = 1,
-        bint use_stabilization = True
+        bint use_stabilization = True,
+        double kp = 0.5,
+        double ki = 0.0,
+        double kd = 0.0
     ):
         """
         Initialize spotlight gimbal controller.
@@ -44,6 +84,9 @@ cdef class SpotlightController:
             i2c_address: MPU6050 I2C address (default: 0x68)
             i2c_bus: I2C bus number (default: 1)
             use_stabilization: Enable IMU-based stabilization
+            kp: Stabilization proportional gain (default: 0.5)
+            ki: Stabilization integral gain, per second (default: 0.0)
+            kd: Stabilization derivative gain, in seconds (default: 0.0)
         """
         # Initialize constants
         self.SERVO_MIN_PULSE = 1000
@@ -65,6 +108,25 @@ cdef class SpotlightController:
         self.pitch_pwm = self.SERVO_CENTER_PULSE
         self.yaw_pwm = self.SERVO_CENTER_PULSE
         
+        # Linear angle -> pulse maps, precomputed so conversion is one
+        # multiply-add per axis (pitch spans 180°, yaw 360°)
+        self._pitch_scale = (self.SERVO_MAX_PULSE - self.SERVO_MIN_PULSE) / 180.0
+        self._pitch_offset = self.SERVO_MIN_PULSE + 90.0 * self._pitch_scale
+        self._yaw_scale = (self.SERVO_MAX_PULSE - self.SERVO_MIN_PULSE) / 360.0
+        self._yaw_offset = self.SERVO_MIN_PULSE + 180.0 * self._yaw_scale
+        
+        self._use_hw_pwm = False
+        
+        # Pulse widths last sent to pigpio (-1: nothing sent yet)
+        self._last_pitch_pulse = -1
+        self._last_yaw_pulse = -1
+        
+        # Stabilization gains and per-axis PID state
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self._reset_pid()
+        
         # Initialize IMU if stabilization is enabled
         if use_stabilization:
             self.mpu = MPU6050(address=i2c_address, bus=i2c_bus)
@@ -91,11 +153,22 @@ cdef class SpotlightController:
             self.pi.set_mode(self.pitch_pin, pigpio.OUTPUT)
             self.pi.set_mode(self.yaw_pin, pigpio.OUTPUT)
             
+            # Hardware PWM needs both servos on distinct PWM channels
+            self._use_hw_pwm = (
+                _hw_pwm_channel(self.pitch_pin) >= 0
+                and _hw_pwm_channel(self.yaw_pin) >= 0
+                and _hw_pwm_channel(self.pitch_pin) != _hw_pwm_channel(self.yaw_pin)
+            )
+            
             # Initialize servos to center position
-            self.pi.set_servo_pulsewidth(self.pitch_pin, self.SERVO_CENTER_PULSE)
-            self.pi.set_servo_pulsewidth(self.yaw_pin, self.SERVO_CENTER_PULSE)
+            self._last_pitch_pulse = -1
+            self._last_yaw_pulse = -1
+            self._write_pulses(self.SERVO_CENTER_PULSE, self.SERVO_CENTER_PULSE)
             
-            logger.info(f"Servos initialized on GPIO pins {self.pitch_pin}, {self.yaw_pin}")
+            logger.info(
+                f"Servos initialized on GPIO pins {self.pitch_pin}, {self.yaw_pin} "
+                f"({'hardware' if self._use_hw_pwm else 'servo'} PWM)"
+            )
             
             # Initialize IMU if enabled
             if self.use_stabilization and self.mpu:
@@ -128,36 +201,49 @@ cdef class SpotlightController:
         Returns:
             True if command sent successfully, False otherwise
         """
-        cdef int pitch_pulse, yaw_pulse
-        
         if not self.is_initialized():
             logger.error("Cannot set position: Controller not initialized")
             return False
         
+        if not self._apply_position(pitch, yaw):
+            return False
+        
+        self.target_pitch = _clamp(pitch, -90, 90)
+        self.target_yaw = _clamp(yaw, -180, 180)
+        return True
+    
+    cdef bint _apply_position(self, double pitch, double yaw):
+        """
+        Drive the servos to an angle without changing the target.
+        
+        Args:
+            pitch: Pitch angle in degrees (clamped to -90 to +90)
+            yaw: Yaw angle in degrees (clamped to -180 to +180)
+            
+        Returns:
+            True if command sent successfully, False otherwise
+        """
         try:
-            # Clamp values to valid ranges
-            if pitch < -90:
-                pitch = -90
-            elif pitch > 90:
-                pitch = 90
-                
-            if yaw < -180:
-                yaw = -180
-            elif yaw > 180:
-                yaw = 180
+            # lround() has no error path, so reject NaN before clamping
+            if isnan(pitch) or isnan(yaw):
+                raise ValueError("angle is NaN")
             
-            self.target_pitch = pitch
-            self.target_yaw = yaw
+            # Clamp values to valid ranges
+            pitch = _clamp(pitch, -90, 90)
+            yaw = _clamp(yaw, -180, 180)
             
             # Convert angles to PWM pulse widths
-            self.pitch_pwm = self._angle_to_pulse(pitch, -90, 90)
-            self.yaw_pwm = self._angle_to_pulse(yaw, -180, 180)
+            self.pitch_pwm = self._angle_to_pulse(pitch, self._pitch_scale, self._pitch_offset)
+            self.yaw_pwm = self._angle_to_pulse(yaw, self._yaw_scale, self._yaw_offset)
             
             # Set servo positions
-            self.pi.set_servo_pulsewidth(self.pitch_pin, self.pitch_pwm)
-            self.pi.set_servo_pulsewidth(self.yaw_pin, self.yaw_pwm)
+            self._write_pulses(self.pitch_pwm, self.yaw_pwm)
             
-            logger.debug(f"Set position - Pitch: {pitch}° ({self.pitch_pwm}µs), Yaw: {yaw}° ({self.yaw_pwm}µs)")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Set position - Pitch: %s° (%sµs), Yaw: %s° (%sµs)",
+                    pitch, self.pitch_pwm, yaw, self.yaw_pwm,
+                )
             return True
             
         except Exception as e:
@@ -185,24 +271,17 @@ cdef class SpotlightController:
         
         try:
             # Clamp speeds to valid range
-            if pitch_speed < -100:
-                pitch_speed = -100
-            elif pitch_speed > 100:
-                pitch_speed = 100
-                
-            if yaw_speed < -100:
-                yaw_speed = -100
-            elif yaw_speed > 100:
-                yaw_speed = 100
+            pitch_speed = _clamp(pitch_speed, -100, 100)
+            yaw_speed = _clamp(yaw_speed, -100, 100)
             
             # Convert speed to PWM pulse width
             pitch_pulse = self.SERVO_CENTER_PULSE + int(pitch_speed * 5)  # ±500µs range
             yaw_pulse = self.SERVO_CENTER_PULSE + int(yaw_speed * 5)
             
-            self.pi.set_servo_pulsewidth(self.pitch_pin, pitch_pulse)
-            self.pi.set_servo_pulsewidth(self.yaw_pin, yaw_pulse)
+            self._write_pulses(pitch_pulse, yaw_pulse)
             
-            logger.debug(f"Set speed - Pitch: {pitch_speed}%, Yaw: {yaw_speed}%")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Set speed - Pitch: %s%%, Yaw: %s%%", pitch_speed, yaw_speed)
             return True
             
         except Exception as e:
@@ -251,58 +330,109 @@ cdef class SpotlightController:
             True if stabilization performed, False otherwise
         """
         cdef double pitch, roll
+        cdef double now, dt
         cdef double correction_pitch, correction_yaw
-        cdef double stabilized_pitch, stabilized_yaw
         
-        if not self.use_stabilization:
+        if not self.use_stabilization or self.mpu is None or not self.mpu.is_initialized():
             return False
         
-        orientation = self.get_orientation()
-        if orientation is None:
+        if not self.is_initialized():
+            logger.error("Cannot stabilize: Controller not initialized")
             return False
         
-        pitch, roll = orientation
+        # Read straight into C doubles (no orientation tuple per iteration)
+        try:
+            self.mpu._read_orientation(&pitch, &roll)
+        except Exception as e:
+            logger.error(f"Failed to get orientation: {e}")
+            return False
         
-        # Simple stabilization: counteract detected tilt
-        correction_pitch = -pitch * 0.5  # Proportional correction
-        correction_yaw = -roll * 0.5
+        # A long gap means the loop was paused; restart rather than
+        # integrating (and differentiating) across it
+        now = time.monotonic()
+        dt = now - self._last_stabilize
+        if self._last_stabilize == 0.0 or dt > _PID_MAX_DT:
+            self._reset_pid()
+            dt = 0.0
+        self._last_stabilize = now
         
-        # Apply corrections to maintain target position
-        stabilized_pitch = self.target_pitch + correction_pitch
-        stabilized_yaw = self.target_yaw + correction_yaw
+        # PID correction counteracting detected tilt, entirely in C
+        correction_pitch = _pid_step(&self._pid_pitch, -pitch, self.kp, self.ki, self.kd, dt)
+        correction_yaw = _pid_step(&self._pid_yaw, -roll, self.kp, self.ki, self.kd, dt)
         
-        return self.set_position(stabilized_pitch, stabilized_yaw)
+        # Offset the servos from the target; the target itself is left as
+        # set, so corrections do not accumulate between updates
+        return self._apply_position(
+            self.target_pitch + correction_pitch,
+            self.target_yaw + correction_yaw,
+        )
     
-    cdef int _angle_to_pulse(self, double angle, double min_angle, double max_angle):
+    cdef void _reset_pid(self):
+        """Clear integral and derivative history for both axes."""
+        self._pid_pitch.integral = 0.0
+        self._pid_pitch.prev_error = 0.0
+        self._pid_yaw.integral = 0.0
+        self._pid_yaw.prev_error = 0.0
+        self._last_stabilize = 0.0
+    
+    cdef int _angle_to_pulse(self, double angle, double scale, double offset):
         """
         Convert angle to PWM pulse width.
         
         Args:
             angle: Angle in degrees
-            min_angle: Minimum angle
-            max_angle: Maximum angle
+            scale: Microseconds per degree for the axis
+            offset: Pulse width at 0 degrees for the axis
             
         Returns:
-            PWM pulse width in microseconds
+            PWM pulse width in microseconds, rounded to the nearest µs
+        """
+        return <int>lround(offset + angle * scale)
+    
+    cdef void _write_pulses(self, int pitch_pulse, int yaw_pulse):
         """
-        cdef double normalized
-        cdef int pulse
+        Emit both servo pulse widths.
         
-        # Normalize angle to 0-1 range
-        normalized = (angle - min_angle) / (max_angle - min_angle)
+        On hardware-PWM pins (GPIO 12/13/18/19, one per PWM channel) the
+        duty cycle is set directly; otherwise pigpio's servo pulses are
+        used.  Both outputs repeat until changed, so an axis whose pulse
+        width equals the last one sent skips pigpio entirely.
         
-        # Map to pulse width range
-        pulse = self.SERVO_MIN_PULSE + int(normalized * (self.SERVO_MAX_PULSE - self.SERVO_MIN_PULSE))
+        pigpio waves are deliberately not used: pigpiod transmits one wave
+        at a time for all of its clients, so a second spotlight controller
+        (or any other wave user) would silence this one.
         
-        return pulse
+        Args:
+            pitch_pulse: Pitch servo pulse width in microseconds
+            yaw_pulse: Yaw servo pulse width in microseconds
+        """
+        if pitch_pulse != self._last_pitch_pulse:
+            if self._use_hw_pwm:
+                self.pi.hardware_PWM(self.pitch_pin, _SERVO_FREQ_HZ,
+                                     pitch_pulse * _HW_PWM_DUTY_PER_US)
+            else:
+                self.pi.set_servo_pulsewidth(self.pitch_pin, pitch_pulse)
+            self._last_pitch_pulse = pitch_pulse
+        if yaw_pulse != self._last_yaw_pulse:
+            if self._use_hw_pwm:
+                self.pi.hardware_PWM(self.yaw_pin, _SERVO_FREQ_HZ,
+                                     yaw_pulse * _HW_PWM_DUTY_PER_US)
+            else:
+                self.pi.set_servo_pulsewidth(self.yaw_pin, yaw_pulse)
+            self._last_yaw_pulse = yaw_pulse
     
     cpdef void close(self):
         """Shutdown controller and cleanup resources."""
         try:
             if self.pi:
                 # Stop servos
+                if self._use_hw_pwm:
+                    self.pi.hardware_PWM(self.pitch_pin, 0, 0)
+                    self.pi.hardware_PWM(self.yaw_pin, 0, 0)
                 self.pi.set_servo_pulsewidth(self.pitch_pin, 0)
                 self.pi.set_servo_pulsewidth(self.yaw_pin, 0)
+                self._last_pitch_pulse = -1
+                self._last_yaw_pulse = -1
                 self.pi.stop()
                 logger.info("Spotlight controller shutdown")
             
@@ -1,141 +1,236 @@
-"""Setup script for cymbal package with Cython support."""
+"""
+Build script for the cymbal Cython extensions.
 
-from setuptools import setup, find_packages, Extension
+Package metadata and dependencies live in pyproject.toml; this file only
+defines the extension modules and their compiler flags.
+"""
+
+import hashlib
+import os
+import platform
+import re
+import shlex
+import shutil
+import sys
+import sysconfig
+
+from setuptools import setup, Extension
+from setuptools.command.build_ext import build_ext
 from Cython.Build import cythonize
+try:
+    from Cython.Build.Cache import get_cython_cache_dir  # Cython >= 3.1
+except ImportError:
+    from Cython.Utils import get_cython_cache_dir
+
+_JOBS = os.cpu_count() or 1
+
+
+def _release_cflags():
+    """
+    Optimisation flags for the extensions, tuned for the build host.
+
+    The package is built on the device it runs on (see docs/CYTHON.md), so
+    the code is tuned to the local CPU: -march=native on x86, -mcpu=native
+    on ARM (where GCC does not accept -march=native on older releases).
+    -ffast-math is deliberately absent: the controllers rely on NaN checks
+    (isnan, NaN-rejecting range tests) that it would compile away.
+    """
+    if sys.platform == "win32":
+        return []
+    flags = ["-O3", "-fno-plt", "-flto"]
+    machine = platform.machine().lower()
+    if machine in ("x86_64", "amd64", "i386", "i686"):
+        flags.append("-march=native")
+    elif machine.startswith(("arm", "aarch64")):
+        flags.append("-mcpu=native")
+    return flags
+
+
+# Build tiers: HOT modules run in the control loop at sensor/servo rate,
+# STD modules run per frame or per message, COLD ones at startup or on
+# user action and are built for size
+HOT, STD, COLD = "hot", "std", "cold"
+
+# CYMBAL_CFLAGS replaces the defaults of every tier, e.g. CYMBAL_CFLAGS="-O2"
+# for portable wheels or CYMBAL_CFLAGS="-O0 -g" for debugging
+if "CYMBAL_CFLAGS" in os.environ:
+    _override = shlex.split(os.environ["CYMBAL_CFLAGS"])
+    TIER_CFLAGS = {HOT: _override, STD: _override, COLD: _override}
+elif sys.platform == "win32":
+    TIER_CFLAGS = {HOT: [], STD: [], COLD: []}
+else:
+    TIER_CFLAGS = {
+        HOT: _release_cflags() + ["-funroll-loops"],
+        STD: _release_cflags(),
+        COLD: ["-Os"],
+    }
+
+
+def _size_flags(cflags):
+    """
+    Return ``(compile_args, link_args)`` that shrink the built extensions.
+
+    Per-function/data sections let the linker drop unreferenced code,
+    hidden visibility leaves PyInit_<module> (marked default-visible by
+    PyMODINIT_FUNC) as the only exported symbol, and --strip-all drops
+    the symbol tables. Skipped for debug (-g) builds.
+    """
+    if not sys.platform.startswith("linux") or any(f.startswith("-g") for f in cflags):
+        return [], []
+    compile_args = ["-ffunction-sections", "-fdata-sections", "-fvisibility=hidden"]
+    return compile_args, ["-Wl,--gc-sections", "-Wl,--strip-all"]
+
+
+def _use_ccache():
+    """Route C/C++ compiles through ccache when it is installed."""
+    ccache = shutil.which("ccache")
+    if ccache is None:
+        return
+    for var in ("CC", "CXX"):
+        compiler = os.environ.get(var) or sysconfig.get_config_var(var)
+        if compiler and "ccache" not in compiler:
+            os.environ[var] = f"{ccache} {compiler}"
+    # Key on compiler contents, not mtime, so toolchain upgrades invalidate
+    os.environ.setdefault("CCACHE_COMPILERCHECK", "content")
 
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
 
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+_use_ccache()
 
-# Add Cython to requirements
-requirements.append("Cython>=0.29.0")
 
-# Define Cython extensions
-extensions = [
+class ParallelBuildExt(build_ext):
+    """build_ext that compiles extensions on all cores unless -j is given."""
+
+    def finalize_options(self):
+        super().finalize_options()
+        if not self.parallel:
+            self.parallel = _JOBS
+
+
+_CIMPORT_RE = re.compile(r"^\s*from\s+(cymbal(?:\.\w+)+)\s+cimport\b", re.MULTILINE)
+
+
+def _pxd_depends(pyx_path):
+    """
+    Return the cymbal .pxd files a .pyx depends on, transitively.
+
+    Includes the module's own .pxd and every cymbal .pxd reachable through
+    ``from cymbal... cimport`` lines, so build_ext relinks an extension
+    whenever a header it was compiled against changes.
+    """
+    depends = []
+    pending = [pyx_path]
+    seen = set()
+    while pending:
+        path = pending.pop()
+        for candidate in (path, os.path.splitext(path)[0] + ".pxd"):
+            if candidate in seen or not os.path.exists(candidate):
+                continue
+            seen.add(candidate)
+            if candidate.endswith(".pxd"):
+                depends.append(candidate)
+            with open(candidate, "r", encoding="utf-8") as fh:
+                for module in _CIMPORT_RE.findall(fh.read()):
+                    pending.append(module.replace(".", "/") + ".pxd")
+    return sorted(depends)
+
+
+# (module, tier); each module is built from the .pyx at its dotted path
+MODULES = [
     # --- Existing modules ---
-    Extension(
-        "cymbal.camera_gimbal.storm32_controller",
-        ["cymbal/camera_gimbal/storm32_controller.pyx"],
-    ),
-    Extension(
-        "cymbal.sensors.mpu6050",
-        ["cymbal/sensors/mpu6050.pyx"],
-    ),
-    Extension(
-        "cymbal.spotlight_gimbal.servo_controller",
-        ["cymbal/spotlight_gimbal/servo_controller.pyx"],
-    ),
-    Extension(
-        "cymbal.config.config",
-        ["cymbal/config/config.pyx"],
-    ),
-    Extension(
-        "cymbal.main",
-        ["cymbal/main.pyx"],
-    ),
+    ("cymbal.camera_gimbal.storm32_controller", HOT),
+    ("cymbal.sensors.mpu6050", HOT),
+    ("cymbal.spotlight_gimbal.servo_controller", HOT),
+    ("cymbal.config.config", COLD),
+    ("cymbal.main", COLD),
     # --- Phase 2: geo, GPS ---
-    Extension(
-        "cymbal.geo.terrain_elevation",
-        ["cymbal/geo/terrain_elevation.pyx"],
-    ),
-    Extension(
-        "cymbal.geo.address_lookup",
-        ["cymbal/geo/address_lookup.pyx"],
-    ),
-    Extension(
-        "cymbal.sensors.gps_sensor",
-        ["cymbal/sensors/gps_sensor.pyx"],
-    ),
+    ("cymbal.geo.terrain_elevation", STD),
+    ("cymbal.geo.address_lookup", COLD),
+    ("cymbal.sensors.gps_sensor", STD),
     # --- Phase 3: S-BUS ---
-    Extension(
-        "cymbal.inputs.sbus_decoder",
-        ["cymbal/inputs/sbus_decoder.pyx"],
-    ),
-    Extension(
-        "cymbal.inputs.sbus_reader",
-        ["cymbal/inputs/sbus_reader.pyx"],
-    ),
+    ("cymbal.inputs.sbus_decoder", HOT),
+    ("cymbal.inputs.sbus_reader", STD),
     # --- Phase 4: OSD, channel mapper ---
-    Extension(
-        "cymbal.osd.overlay_controller",
-        ["cymbal/osd/overlay_controller.pyx"],
-    ),
-    Extension(
-        "cymbal.inputs.channel_mapper",
-        ["cymbal/inputs/channel_mapper.pyx"],
-    ),
+    ("cymbal.osd.overlay_controller", STD),
+    ("cymbal.inputs.channel_mapper", STD),
     # --- Gimbal abstraction layer ---
-    Extension(
-        "cymbal.gimbals.base",
-        ["cymbal/gimbals/base.pyx"],
-    ),
-    Extension(
-        "cymbal.gimbals.storm32_adapter",
-        ["cymbal/gimbals/storm32_adapter.pyx"],
-    ),
-    Extension(
-        "cymbal.gimbals.servo_adapter",
-        ["cymbal/gimbals/servo_adapter.pyx"],
-    ),
-    Extension(
-        "cymbal.gimbals.simplebgc_stub",
-        ["cymbal/gimbals/simplebgc_stub.pyx"],
-    ),
+    ("cymbal.gimbals.base", STD),
+    ("cymbal.gimbals.storm32_adapter", STD),
+    ("cymbal.gimbals.servo_adapter", STD),
+    ("cymbal.gimbals.simplebgc_stub", COLD),
     # --- Controller ---
-    Extension(
-        "cymbal.controller.telemetry_provider",
-        ["cymbal/controller/telemetry_provider.pyx"],
-    ),
-    Extension(
-        "cymbal.controller.socket_telemetry_provider",
-        ["cymbal/controller/socket_telemetry_provider.pyx"],
-    ),
-    Extension(
-        "cymbal.controller.cymbal_controller",
-        ["cymbal/controller/cymbal_controller.pyx"],
-    ),
+    ("cymbal.controller.telemetry_provider", STD),
+    ("cymbal.controller.socket_telemetry_provider", STD),
+    ("cymbal.controller.cymbal_controller", STD),
 ]
 
+
+def _extension(name, tier):
+    source = name.replace(".", "/") + ".pyx"
+    cflags = TIER_CFLAGS[tier]
+    size_cflags, size_ldflags = _size_flags(cflags)
+    return Extension(
+        name,
+        [source],
+        depends=_pxd_depends(source),
+        extra_compile_args=cflags + size_cflags,
+        extra_link_args=(["-flto"] if "-flto" in cflags else []) + size_ldflags,
+    )
+
+
+extensions = [_extension(name, tier) for name, tier in MODULES]
+
+COMPILER_DIRECTIVES = {
+    "language_level": "3",
+    "embedsignature": True,
+    "boundscheck": False,
+    "wraparound": False,
+    "cdivision": True,
+    "cdivision_warnings": False,
+    "initializedcheck": False,
+    "nonecheck": False,
+    "overflowcheck": False,
+    # No tracing hooks, and no .pyx source echoed into the generated C
+    "linetrace": False,
+    "profile": False,
+    "emit_code_comments": False,
+}
+
+# HOT extensions also get plain C-level method wrappers (binding=False) and
+# METH_NOARGS/METH_O entry points for zero/one-argument methods
+# (always_allow_keywords=False), so those methods cannot be called with
+# keyword arguments.
+HOT_EXTENSIONS = {name for name, tier in MODULES if tier == HOT}
+HOT_DIRECTIVES = dict(COMPILER_DIRECTIVES, binding=False, always_allow_keywords=False)
+
+
+def _cython_cache(directives):
+    """
+    Return a Cython cache directory specific to a set of directives.
+
+    Cython's cache fingerprint covers the sources and .pxd files but not
+    compiler_directives, so a directive change would otherwise be served
+    stale C from the cache.
+    """
+    key = hashlib.sha1(repr(sorted(directives.items())).encode()).hexdigest()
+    return os.path.join(get_cython_cache_dir(), "compiler", key[:12])
+
+
+def _cythonize(exts, directives):
+    return cythonize(
+        exts,
+        # Reuse generated C for unchanged .pyx/.pxd inputs, keyed on a content
+        # fingerprint (under $CYTHON_CACHE_DIR, else Cython's default)
+        cache=_cython_cache(directives),
+        nthreads=_JOBS,
+        compiler_directives=directives,
+    )
+
+
 setup(
-    name="cymbal",
-    version="0.4.0",
-    author="gtraines",
-    description="Control software for dual gimbals on fixed-wing drones (Cython optimized)",
-    long_description=long_description,
-    long_description_content_type="text/markdown",
-    url="https://github.com/gtraines/cymbal",
-    packages=find_packages(),
-    ext_modules=cythonize(
-        extensions,
-        compiler_directives={
-            "language_level": "3",
-            "embedsignature": True,
-            "boundscheck": False,
-            "wraparound": False,
-            "cdivision": True,
-        }
+    ext_modules=(
+        _cythonize([e for e in extensions if e.name in HOT_EXTENSIONS], HOT_DIRECTIVES)
+        + _cythonize([e for e in extensions if e.name not in HOT_EXTENSIONS],
+                     COMPILER_DIRECTIVES)
     ),
-    classifiers=[
-        "Development Status :: 3 - Alpha",
-        "Intended Audience :: Developers",
-        "Topic :: System :: Hardware :: Hardware Drivers",
-        "License :: OSI Approved :: MIT License",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Cython",
-        "Operating System :: POSIX :: Linux",
-    ],
-    python_requires=">=3.7",
-    install_requires=requirements,
-    setup_requires=["Cython>=0.29.0"],
-    entry_points={
-        "console_scripts": [
-            "cymbal=cymbal.main:main",
-        ],
-    },
+    cmdclass={"build_ext": ParallelBuildExt},
 )
@@ -6,6 +6,7 @@ These tests load config.pyx as plain Python (it has no C-typed declarations)
 so they run without compiled Cython extensions.
 """
 
+import dataclasses
 import json
 import os
 import sys
@@ -230,6 +231,47 @@ class TestSystemConfigGimbals(unittest.TestCase):
         finally:
             os.unlink(tmp)
 
+    def _save_and_reload(self):
+        cfg = SystemConfig.load('/nonexistent/config.json')
+        cfg.log_level = 'WARNING'
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            tmp = f.name
+        try:
+            cfg.save(tmp)
+            with open(tmp) as f:
+                raw = json.load(f)
+            return raw, SystemConfig.load(tmp)
+        finally:
+            os.unlink(tmp)
+
+    def test_save_load_round_trip(self):
+        raw, cfg = self._save_and_reload()
+        self.assertEqual(raw['log_level'], 'WARNING')
+        self.assertEqual(cfg.log_level, 'WARNING')
+        self.assertEqual(len(cfg.gimbals), 2)
+
+    def test_save_load_round_trip_without_orjson(self):
+        saved, _mod.orjson = _mod.orjson, None
+        try:
+            raw, cfg = self._save_and_reload()
+        finally:
+            _mod.orjson = saved
+        self.assertEqual(cfg.log_level, 'WARNING')
+        self.assertEqual(len(cfg.gimbals), 2)
+
+    def test_section_to_dict_matches_fields(self):
+        cfg = SystemConfig()
+        for name in ('camera_gimbal', 'spotlight_gimbal', 'gps', 'geo', 'osd',
+                     'sbus', 'telemetry', 'channel_map'):
+            section = getattr(cfg, name)
+            with self.subTest(section=name):
+                self.assertEqual(section.to_dict(), dataclasses.asdict(section))
+
+    def test_section_to_dict_copies_lists(self):
+        cfg = SystemConfig()
+        cfg.to_dict()['osd']['text_color'][0] = 0
+        self.assertEqual(cfg.osd.text_color, [255, 255, 255])
+
     def test_legacy_keys_still_load_with_deprecation(self):
         """Old JSON with only camera_gimbal/spotlight_gimbal keys must still load."""
         data = {
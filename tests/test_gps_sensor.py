@@ -36,6 +36,7 @@ if "pynmea2" not in sys.modules:
 if "serial" not in sys.modules:
     serial_mod = types.ModuleType("serial")
     serial_mod.Serial = object
+    serial_mod.SerialException = type("SerialException", (IOError,), {})
     serial_mod.EIGHTBITS = 8
     serial_mod.PARITY_NONE = "N"
     serial_mod.STOPBITS_ONE = 1
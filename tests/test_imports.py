@@ -4,36 +4,61 @@ Basic import tests for cymbal airborne gimbal modules.
 These tests verify that all modules can be imported without errors.
 """
 
+import contextlib
+import importlib
+import io
+import subprocess
+import sys
 import unittest
 
 
 class TestImports(unittest.TestCase):
     """Test that all modules can be imported."""
     
-    def test_import_storm32_controller(self):
-        """Test importing Storm32Controller."""
-        from cymbal.camera_gimbal import Storm32Controller
-        self.assertIsNotNone(Storm32Controller)
-    
-    def test_import_spotlight_controller(self):
-        """Test importing SpotlightController."""
-        from cymbal.spotlight_gimbal import SpotlightController
-        self.assertIsNotNone(SpotlightController)
-    
-    def test_import_mpu6050(self):
-        """Test importing MPU6050."""
-        from cymbal.sensors import MPU6050
-        self.assertIsNotNone(MPU6050)
-    
-    def test_import_config(self):
-        """Test importing configuration classes."""
-        from cymbal.config.config import SystemConfig
-        self.assertIsNotNone(SystemConfig)
+    # (module path, exported name) — one import_module call per case
+    EXPORTS = [
+        ("cymbal.camera_gimbal", "Storm32Controller"),
+        ("cymbal.spotlight_gimbal", "SpotlightController"),
+        ("cymbal.sensors", "MPU6050"),
+        ("cymbal.config.config", "SystemConfig"),
+        ("cymbal.main", "GimbalController"),
+    ]
+
+    def test_import_exports(self):
+        """Test importing each public export from its module."""
+        for modpath, name in self.EXPORTS:
+            with self.subTest(module=modpath, name=name):
+                module = importlib.import_module(modpath)
+                self.assertIsNotNone(getattr(module, name))
     
-    def test_import_main(self):
-        """Test importing main controller."""
-        from cymbal.main import GimbalController
-        self.assertIsNotNone(GimbalController)
+    def test_main_version_exits_before_startup(self):
+        """Test that ``cymbal --version`` exits without loading config."""
+        import cymbal
+        from cymbal.main import main
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), self.assertRaises(SystemExit) as cm:
+            main(['--version'])
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(out.getvalue().strip(), f"cymbal {cymbal.__version__}")
+
+    def test_package_exports_are_lazy(self):
+        """Test that ``import cymbal`` defers its exports until first access."""
+        code = (
+            "import sys, cymbal\n"
+            "mod = 'cymbal.camera_gimbal.storm32_controller'\n"
+            "print(mod in sys.modules, 'cv2' in sys.modules)\n"
+            "cymbal.Storm32Controller\n"
+            "print(mod in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.split(), ["False", "False", "True"])
+
+    def test_package_unknown_attribute(self):
+        """Test that unknown package attributes still raise AttributeError."""
+        import cymbal
+        with self.assertRaises(AttributeError):
+            cymbal.NoSuchExport
 
 
 if __name__ == '__main__':
@@ -0,0 +1,309 @@
+"""
+Unit tests for SpotlightController servo output.
+
+pigpio is replaced by an in-memory fake that records daemon calls, so no
+Raspberry Pi or pigpiod is required.  Tests are skipped when the Cython
+extension has not been compiled.
+"""
+
+import types
+import unittest
+from unittest import mock
+
+
+# ---------------------------------------------------------------------------
+# Fake pigpio
+# ---------------------------------------------------------------------------
+
+class _FakePi:
+    """Records pigpio daemon calls made by SpotlightController."""
+
+    def __init__(self):
+        self.connected = True
+        self.calls = []
+
+    def set_mode(self, gpio, mode):
+        self.calls.append(('set_mode', gpio, mode))
+
+    def set_servo_pulsewidth(self, gpio, pulse):
+        self.calls.append(('set_servo_pulsewidth', gpio, pulse))
+
+    def hardware_PWM(self, gpio, frequency, dutycycle):
+        self.calls.append(('hardware_PWM', gpio, frequency, dutycycle))
+
+    def stop(self):
+        self.calls.append(('stop',))
+
+    def names(self):
+        return [c[0] for c in self.calls]
+
+
+class _FakeSMBus:
+    """MPU6050 register file; accel values are raw 16-bit LSB counts."""
+
+    def __init__(self, bus):
+        self.accel = {0x3B: 0, 0x3D: 0, 0x3F: 16384}
+
+    def write_byte_data(self, address, register, value):
+        pass
+
+    def read_byte_data(self, address, register):
+        if register in self.accel:
+            return (self.accel[register] & 0xFFFF) >> 8
+        return self.accel.get(register - 1, 0) & 0xFF
+
+    def close(self):
+        pass
+
+
+def _fake_pigpio(pi):
+    return types.SimpleNamespace(
+        pi=lambda: pi,
+        OUTPUT=1,
+    )
+
+
+def _initialized_controller(**kwargs):
+    try:
+        from cymbal.spotlight_gimbal import servo_controller as mod
+    except ImportError:
+        raise unittest.SkipTest("servo_controller extension not compiled")
+
+    pi = _FakePi()
+    patcher = mock.patch.object(mod, 'pigpio', _fake_pigpio(pi))
+    patcher.start()
+    ctrl = mod.SpotlightController(use_stabilization=False, **kwargs)
+    assert ctrl.initialize()
+    pi.calls.clear()
+    return ctrl, pi, patcher
+
+
+class _ControllerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.ctrl, self.pi, patcher = _initialized_controller()
+        self.addCleanup(patcher.stop)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestSpotlightPulseMapping(_ControllerTestCase):
+
+    def test_pitch_endpoints_and_center(self):
+        for angle, pulse in ((-90.0, 1000), (0.0, 1500), (90.0, 2000), (45.0, 1750)):
+            self.ctrl.set_position(angle, 0.0)
+            self.assertEqual(self.ctrl.pitch_pwm, pulse)
+
+    def test_yaw_endpoints_and_center(self):
+        for angle, pulse in ((-180.0, 1000), (0.0, 1500), (180.0, 2000), (-90.0, 1250)):
+            self.ctrl.set_position(0.0, angle)
+            self.assertEqual(self.ctrl.yaw_pwm, pulse)
+
+    def test_out_of_range_is_clamped(self):
+        self.ctrl.set_position(120.0, -400.0)
+        self.assertEqual((self.ctrl.pitch_pwm, self.ctrl.yaw_pwm), (2000, 1000))
+
+    def test_nan_angle_is_rejected(self):
+        self.assertFalse(self.ctrl.set_position(float('nan'), 0.0))
+        self.assertEqual(self.pi.calls, [])
+
+    def test_speed_is_clamped(self):
+        self.ctrl.set_speed(250.0, -250.0)
+        self.assertEqual(self.pi.calls, [
+            ('set_servo_pulsewidth', 17, 2000),
+            ('set_servo_pulsewidth', 27, 1000),
+        ])
+
+    def test_pulse_rounds_to_nearest_microsecond(self):
+        self.ctrl.set_position(0.1, 0.0)   # 1500.56 µs
+        self.assertEqual(self.ctrl.pitch_pwm, 1501)
+
+
+class TestSpotlightServoOutput(_ControllerTestCase):
+
+    def test_position_sets_both_pulse_widths(self):
+        self.assertTrue(self.ctrl.set_position(45.0, -90.0))
+        self.assertEqual(self.pi.calls, [
+            ('set_servo_pulsewidth', 17, 1750),
+            ('set_servo_pulsewidth', 27, 1250),
+        ])
+
+    def test_only_changed_axis_is_written(self):
+        self.ctrl.set_position(10.0, 20.0)
+        self.pi.calls.clear()
+        self.ctrl.set_position(10.0, 40.0)
+        self.assertEqual(self.pi.calls, [('set_servo_pulsewidth', 27, 1611)])
+
+    def test_unchanged_pulses_skip_pigpio(self):
+        self.ctrl.set_position(10.0, 20.0)
+        self.pi.calls.clear()
+        self.assertTrue(self.ctrl.set_position(10.0, 20.0))
+        self.assertTrue(self.ctrl.set_position(10.05, 20.05))   # same µs
+        self.assertEqual(self.pi.calls, [])
+
+    def test_initialize_resends_after_close(self):
+        self.ctrl.close()
+        self.pi.calls.clear()
+        self.assertTrue(self.ctrl.initialize())
+        self.assertIn(('set_servo_pulsewidth', 17, 1500), self.pi.calls)
+        self.assertIn(('set_servo_pulsewidth', 27, 1500), self.pi.calls)
+
+    def test_speed_sets_pulse_widths(self):
+        self.ctrl.set_speed(50.0, -100.0)
+        self.assertEqual(self.pi.calls, [
+            ('set_servo_pulsewidth', 17, 1750),
+            ('set_servo_pulsewidth', 27, 1000),
+        ])
+
+    def test_close_turns_off_only_own_pins(self):
+        self.ctrl.set_position(10.0, 20.0)
+        self.pi.calls.clear()
+        self.ctrl.close()
+        self.assertEqual(self.pi.calls, [
+            ('set_servo_pulsewidth', 17, 0),
+            ('set_servo_pulsewidth', 27, 0),
+            ('stop',),
+        ])
+
+    def test_two_controllers_drive_independent_pins(self):
+        other, other_pi, patcher = _initialized_controller(pitch_pin=5, yaw_pin=6)
+        self.addCleanup(patcher.stop)
+        self.ctrl.set_position(45.0, 0.0)
+        other.set_position(-45.0, 0.0)
+        other.close()
+        self.assertEqual(self.pi.calls, [('set_servo_pulsewidth', 17, 1750)])
+        self.assertNotIn(17, [c[1] for c in other_pi.calls if len(c) > 1])
+
+
+class TestSpotlightHardwarePWM(unittest.TestCase):
+
+    def setUp(self):
+        self.ctrl, self.pi, patcher = _initialized_controller(pitch_pin=18, yaw_pin=13)
+        self.addCleanup(patcher.stop)
+
+    def test_position_sets_duty_cycle(self):
+        self.assertTrue(self.ctrl.set_position(45.0, -90.0))
+        self.assertEqual(self.pi.calls, [
+            ('hardware_PWM', 18, 50, 87500),     # 1750 µs of 20 ms
+            ('hardware_PWM', 13, 50, 62500),     # 1250 µs
+        ])
+        self.assertNotIn('set_servo_pulsewidth', self.pi.names())
+
+    def test_initialize_centers_with_hardware_pwm(self):
+        ctrl, pi, patcher = _initialized_controller(pitch_pin=12, yaw_pin=19)
+        self.addCleanup(patcher.stop)
+        ctrl.initialize()
+        self.assertIn(('hardware_PWM', 12, 50, 75000), pi.calls)
+        self.assertNotIn('set_servo_pulsewidth', pi.names())
+
+    def test_only_changed_axis_is_written(self):
+        self.ctrl.set_position(45.0, -90.0)
+        self.pi.calls.clear()
+        self.ctrl.set_position(45.0, 90.0)
+        self.assertEqual(self.pi.calls, [('hardware_PWM', 13, 50, 87500)])
+        self.pi.calls.clear()
+        self.ctrl.set_position(45.0, 90.0)
+        self.assertEqual(self.pi.calls, [])
+
+    def test_shared_channel_falls_back_to_servo_pulses(self):
+        ctrl, pi, patcher = _initialized_controller(pitch_pin=12, yaw_pin=18)
+        self.addCleanup(patcher.stop)
+        ctrl.set_position(10.0, 20.0)
+        self.assertNotIn('hardware_PWM', pi.names())
+        self.assertIn('set_servo_pulsewidth', pi.names())
+
+    def test_close_stops_hardware_pwm(self):
+        self.ctrl.close()
+        self.assertIn(('hardware_PWM', 18, 0, 0), self.pi.calls)
+        self.assertIn(('hardware_PWM', 13, 0, 0), self.pi.calls)
+
+
+class TestSpotlightStabilize(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            from cymbal.sensors import mpu6050 as mpu_mod
+            from cymbal.spotlight_gimbal import servo_controller as mod
+        except ImportError:
+            raise unittest.SkipTest("servo_controller extension not compiled")
+
+        self.bus = _FakeSMBus(1)
+        self.pi = _FakePi()
+        for patcher in (
+            mock.patch.object(mod, 'pigpio', _fake_pigpio(self.pi)),
+            mock.patch.object(mpu_mod, 'smbus',
+                              types.SimpleNamespace(SMBus=lambda bus: self.bus)),
+            mock.patch.object(mpu_mod.time, 'sleep', lambda s: None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.mod = mod
+        self.clock = [100.0]
+        patcher = mock.patch.object(mod.time, 'monotonic', lambda: self.clock[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.ctrl = mod.SpotlightController(use_stabilization=True)
+        self.assertTrue(self.ctrl.initialize())
+
+    def _tick(self, dt=0.01):
+        self.clock[0] += dt
+        return self.ctrl.stabilize()
+
+    def test_level_sensor_holds_target(self):
+        self.ctrl.set_position(20.0, 40.0)
+        self.assertTrue(self.ctrl.stabilize())
+        self.assertAlmostEqual(self.ctrl.target_pitch, 20.0)
+        self.assertAlmostEqual(self.ctrl.target_yaw, 40.0)
+
+    def test_tilt_applies_half_correction(self):
+        self.ctrl.set_position(0.0, 0.0)
+        self.bus.accel[0x3D] = 16384      # +1 g on Y: 45° pitch
+        self.assertTrue(self.ctrl.stabilize())
+        self.assertEqual(self.ctrl.pitch_pwm, 1375)   # -22.5°
+        self.assertEqual(self.ctrl.yaw_pwm, 1500)
+
+    def test_correction_does_not_move_target(self):
+        self.ctrl.set_position(0.0, 0.0)
+        self.bus.accel[0x3D] = 16384
+        for _ in range(3):
+            self.assertTrue(self._tick())
+            self.assertEqual(self.ctrl.pitch_pwm, 1375)
+        self.assertEqual(self.ctrl.target_pitch, 0.0)
+
+    def test_integral_accumulates_steady_error(self):
+        self.ctrl.kp, self.ctrl.ki = 0.0, 1.0
+        self.bus.accel[0x3D] = 16384      # constant 45° error
+        self.ctrl.stabilize()             # first sample: no integration
+        self.assertEqual(self.ctrl.pitch_pwm, 1500)
+        self._tick(0.2)                   # -45 * 0.2 = -9°
+        self.assertEqual(self.ctrl.pitch_pwm, 1450)
+        self._tick(0.2)
+        self.assertEqual(self.ctrl.pitch_pwm, 1400)
+
+    def test_derivative_responds_to_change(self):
+        self.ctrl.kp, self.ctrl.kd = 0.0, 0.1
+        self.ctrl.stabilize()
+        self.bus.accel[0x3D] = 16384      # 0° -> 45° in 0.5 s: 90°/s
+        self._tick(0.5)
+        self.assertEqual(self.ctrl.pitch_pwm, 1450)   # -9°
+
+    def test_pause_resets_integral(self):
+        self.ctrl.kp, self.ctrl.ki = 0.0, 1.0
+        self.bus.accel[0x3D] = 16384
+        self.ctrl.stabilize()
+        self._tick(0.2)
+        self.assertEqual(self.ctrl.pitch_pwm, 1450)
+        self._tick(5.0)                   # loop paused: start over
+        self.assertEqual(self.ctrl.pitch_pwm, 1500)
+
+    def test_disabled_stabilization_is_noop(self):
+        self.ctrl.use_stabilization = False
+        self.assertFalse(self.ctrl.stabilize())
+
+
+if __name__ == '__main__':
+    unittest.main()
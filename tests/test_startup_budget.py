@@ -0,0 +1,104 @@
+"""
+Startup budget test for the ``cymbal`` CLI.
+
+Runs ``import cymbal.main`` under ``python -X importtime`` in a subprocess
+and checks that the import stays within a time budget and does not pull in
+any heavy third-party module or the extension stack.  A new module-level
+import in main.pyx shows up here as a failure rather than as a slower
+``cymbal --help``.
+"""
+
+import re
+import subprocess
+import sys
+import unittest
+
+
+# "import time: <self us> | <cumulative us> | <indent><module>", where the
+# indent is two spaces per nesting level
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def _cymbal_imports(stderr):
+    """
+    Parse an ``-X importtime`` trace of ``import cymbal.main``.
+
+    Returns ``(total_us, modules)``: the cumulative time of the top-level
+    ``cymbal`` imports and the names of every module imported beneath them.
+    Interpreter startup imports (encodings, site, ...) are excluded.
+    """
+    total_us = 0
+    modules = []
+    pending = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match is None:
+            continue
+        _self_us, cumulative_us, indent, name = match.groups()
+        if indent:
+            pending.append(name)
+            continue
+        # Entries are printed after their children, so a top-level entry
+        # closes the subtree collected in ``pending``
+        if name == "cymbal" or name.startswith("cymbal."):
+            total_us += int(cumulative_us)
+            modules.extend(pending)
+            modules.append(name)
+        pending = []
+    return total_us, modules
+
+
+class TestStartupBudget(unittest.TestCase):
+    """Test the import cost of the ``cymbal`` entry point."""
+
+    # Generous enough for a Pi-class companion computer; a single eager
+    # numpy or cv2 import exceeds it on its own
+    BUDGET_US = 200_000
+
+    # Top-level packages that must stay out of ``import cymbal.main``
+    FORBIDDEN = (
+        "numpy", "cv2", "matplotlib", "serial", "smbus2", "pigpio",
+        "pymavlink", "orjson", "pynmea2", "srtm",
+    )
+
+    # cymbal subpackages that are imported only once the controller starts
+    DEFERRED = (
+        "cymbal.controller", "cymbal.gimbals", "cymbal.sensors",
+        "cymbal.camera_gimbal", "cymbal.spotlight_gimbal", "cymbal.config",
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        cmd = [sys.executable, "-X", "importtime", "-c", "import cymbal.main"]
+        # Warm-up run so bytecode compilation is not counted
+        subprocess.run(cmd, capture_output=True, check=True)
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        cls.total_us, cls.modules = _cymbal_imports(result.stderr)
+
+    def test_trace_parsed(self):
+        """Test that the trace contains the cymbal.main import."""
+        self.assertIn("cymbal.main", self.modules)
+
+    def test_import_within_budget(self):
+        """Test that ``import cymbal.main`` stays within the time budget."""
+        self.assertLess(self.total_us, self.BUDGET_US)
+
+    def test_no_heavy_imports(self):
+        """Test that no heavy third-party module is imported at startup."""
+        for name in self.FORBIDDEN:
+            with self.subTest(module=name):
+                loaded = [m for m in self.modules
+                          if m == name or m.startswith(name + ".")]
+                self.assertEqual(loaded, [])
+
+    def test_extension_stack_deferred(self):
+        """Test that the controller and driver modules are not imported."""
+        for name in self.DEFERRED:
+            with self.subTest(module=name):
+                loaded = [m for m in self.modules
+                          if m == name or m.startswith(name + ".")]
+                self.assertEqual(loaded, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,480 @@
+"""
+Unit tests for Storm32Controller serial framing.
+
+The serial port is replaced by an in-memory fake so no hardware is required.
+Tests are skipped when the Cython extension has not been compiled.
+"""
+
+import os
+import struct
+import threading
+import unittest
+from unittest import mock
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _mav2_frame(payload, signed=False, msgid=158):
+    """Build a MAVLink v2 frame (CRC/signature bytes are zero-filled)."""
+    header = bytes([
+        0xFD, len(payload), 0x01 if signed else 0x00, 0x00,
+        0x00, 0x01, 0x9A,
+    ]) + struct.pack('<I', msgid)[:3]
+    trailer = bytes(2 + (13 if signed else 0))
+    return header + bytes(payload) + trailer
+
+
+class _FakeSerial:
+    """
+    Minimal pyserial stand-in backed by a byte buffer.
+
+    ``rx`` holds bytes already received.  ``reply`` holds what the gimbal
+    sends in answer to the next status request; it lands in ``rx`` when
+    ``get_status`` resets the input buffer just before sending the request.
+    """
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.is_open = True
+        self.rx = bytearray()
+        self.reply = bytearray()
+        self.tx = []
+        self.reads = []
+        self.write_error = None
+
+    def write(self, data):
+        if self.write_error is not None:
+            raise self.write_error
+        self.tx.append(bytes(data))
+        return len(data)
+
+    def read(self, size=1):
+        self.reads.append(size)
+        chunk = bytes(self.rx[:size])
+        del self.rx[:size]
+        return chunk
+
+    def reset_input_buffer(self):
+        self.rx = self.reply
+        self.reply = bytearray()
+
+    def close(self):
+        self.is_open = False
+
+
+def _connected_controller(native=True):
+    """
+    Return (controller, fake_serial).
+
+    native=True forces the simplified frame format even when pymavlink is
+    installed; native=False requires pymavlink.
+    """
+    try:
+        from cymbal.camera_gimbal import storm32_controller as mod
+    except ImportError:
+        raise unittest.SkipTest("storm32_controller extension not compiled")
+    if not native and mod.mavlink is None:
+        raise unittest.SkipTest("pymavlink not installed")
+
+    fake = _FakeSerial()
+    with mock.patch.object(mod.serial, 'Serial', lambda **kw: fake):
+        if native:
+            with mock.patch.object(mod, 'mavlink', None):
+                ctrl = mod.Storm32Controller(port="/dev/null")
+        else:
+            ctrl = mod.Storm32Controller(port="/dev/null")
+        assert ctrl.connect()
+    return ctrl, fake
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestStorm32GetStatus(unittest.TestCase):
+
+    def test_reads_header_then_exact_payload(self):
+        ctrl, fake = _connected_controller()
+        fake.reply += _mav2_frame(b'\x00' * 20)
+        status = ctrl.get_status()
+        self.assertIsNotNone(status)
+        self.assertEqual(fake.reads, [10, 22])
+
+    def test_signed_frame_reads_signature(self):
+        ctrl, fake = _connected_controller()
+        fake.reply += _mav2_frame(b'\x00' * 4, signed=True)
+        self.assertIsNotNone(ctrl.get_status())
+        self.assertEqual(fake.reads, [10, 4 + 2 + 13])
+
+    def test_leaves_following_frame_unread(self):
+        ctrl, fake = _connected_controller()
+        second = _mav2_frame(b'\x01' * 8)
+        fake.reply += _mav2_frame(b'\x00' * 8) + second
+        ctrl.get_status()
+        self.assertEqual(bytes(fake.rx), second)
+
+    def test_resyncs_on_leading_garbage(self):
+        ctrl, fake = _connected_controller()
+        fake.reply += b'\x55\x55' + _mav2_frame(b'\x00' * 6)
+        self.assertIsNotNone(ctrl.get_status())
+        self.assertEqual(len(fake.rx), 0)
+
+    def test_timeout_returns_none(self):
+        ctrl, fake = _connected_controller()
+        self.assertIsNone(ctrl.get_status())
+
+    def test_truncated_payload_returns_none(self):
+        ctrl, fake = _connected_controller()
+        fake.reply += _mav2_frame(b'\x00' * 20)[:15]
+        self.assertIsNone(ctrl.get_status())
+
+
+class TestStorm32Commands(unittest.TestCase):
+
+    def test_angle_frame_layout(self):
+        ctrl, fake = _connected_controller()
+        self.assertTrue(ctrl.set_angle(12.5, -3.0, 45.0))
+        self.assertEqual(
+            fake.tx[-1], b'\xFA\x0E' + struct.pack('<3h', 1250, -300, 4500)
+        )
+
+    def test_angle_is_clamped(self):
+        ctrl, fake = _connected_controller()
+        ctrl.set_angle(120.0, -95.0, 200.0)
+        self.assertEqual(
+            fake.tx[-1], b'\xFA\x0E' + struct.pack('<3h', 9000, -9000, 18000)
+        )
+
+    def test_nan_angle_is_rejected(self):
+        ctrl, fake = _connected_controller()
+        self.assertFalse(ctrl.set_angle(float('nan'), 0.0, 0.0))
+        self.assertEqual(fake.tx, [])
+
+    def test_speed_frame_layout(self):
+        ctrl, fake = _connected_controller()
+        self.assertTrue(ctrl.set_speed(10.0, 0.0, -2.5))
+        self.assertEqual(
+            fake.tx[-1], b'\xFA\x0F' + struct.pack('<3h', 100, 0, -25)
+        )
+
+    def test_speed_out_of_range_fails(self):
+        ctrl, fake = _connected_controller()
+        self.assertFalse(ctrl.set_speed(10000.0, 0.0, 0.0))
+        self.assertEqual(fake.tx, [])
+
+    def test_speed_int16_limits(self):
+        ctrl, fake = _connected_controller()
+        self.assertTrue(ctrl.set_speed(3276.7, -3276.8, -0.15))
+        self.assertEqual(
+            fake.tx[-1], b'\xFA\x0F' + struct.pack('<3h', 32767, -32768, -1)
+        )
+
+    def test_native_frame_is_written_without_copy(self):
+        ctrl, fake = _connected_controller()
+        fake.write = written = mock.Mock()
+        ctrl.set_angle(1.0, 2.0, 3.0)
+        frame = written.call_args[0][0]
+        self.assertIsInstance(frame, memoryview)
+        self.assertEqual(frame.nbytes, 8)
+
+    def test_consecutive_frames_are_independent(self):
+        ctrl, fake = _connected_controller()
+        ctrl.set_angle(1.0, 2.0, 3.0)
+        ctrl.set_speed(4.0, 5.0, 6.0)
+        self.assertEqual(fake.tx[0][:2], b'\xFA\x0E')
+        self.assertEqual(fake.tx[1][:2], b'\xFA\x0F')
+        self.assertEqual(len(fake.tx[1]), 8)
+
+    def test_status_request_frame(self):
+        ctrl, fake = _connected_controller()
+        ctrl.get_status()
+        self.assertEqual(fake.tx[-1], b'\xFA\x10')
+
+
+class TestStorm32MAVLink(unittest.TestCase):
+
+    def _gimbal_side(self):
+        from pymavlink.dialects.v20 import ardupilotmega as mavlink
+        return mavlink, mavlink.MAVLink(None, srcSystem=1, srcComponent=154)
+
+    def test_angle_encodes_mount_control(self):
+        ctrl, fake = _connected_controller(native=False)
+        mavlink, gimbal = self._gimbal_side()
+        ctrl.set_angle(12.5, -3.0, 45.0)
+        msg = gimbal.decode(bytearray(fake.tx[-1]))
+        self.assertEqual(msg.get_type(), "MOUNT_CONTROL")
+        self.assertEqual(msg.target_component, mavlink.MAV_COMP_ID_GIMBAL)
+        self.assertEqual(
+            (msg.input_a, msg.input_b, msg.input_c), (1250, -300, 4500)
+        )
+
+    def test_sequence_number_advances(self):
+        ctrl, fake = _connected_controller(native=False)
+        ctrl.center()
+        ctrl.center()
+        self.assertEqual((fake.tx[1][4] - fake.tx[0][4]) % 256, 1)
+
+    def test_speed_encodes_gimbal_device_attitude(self):
+        ctrl, fake = _connected_controller(native=False)
+        mavlink, gimbal = self._gimbal_side()
+        ctrl.set_speed(90.0, 0.0, -45.0)
+        msg = gimbal.decode(bytearray(fake.tx[-1]))
+        self.assertEqual(msg.get_type(), "GIMBAL_DEVICE_SET_ATTITUDE")
+        self.assertAlmostEqual(msg.angular_velocity_y, 1.5707963, places=5)
+        self.assertAlmostEqual(msg.angular_velocity_z, -0.7853981, places=5)
+
+    def test_status_decodes_mount_status(self):
+        ctrl, fake = _connected_controller(native=False)
+        mavlink, gimbal = self._gimbal_side()
+        fake.reply += gimbal.mount_status_encode(1, 191, -1500, 250, 9000).pack(gimbal)
+        status = ctrl.get_status()
+        request = gimbal.decode(bytearray(fake.tx[-1]))
+        self.assertEqual(request.command, mavlink.MAV_CMD_REQUEST_MESSAGE)
+        self.assertEqual(request.param1, mavlink.MAVLINK_MSG_ID_MOUNT_STATUS)
+        self.assertEqual(status["pitch"], -15.0)
+        self.assertEqual(status["roll"], 2.5)
+        self.assertEqual(status["yaw"], 90.0)
+
+    def test_status_skips_heartbeat_and_ack(self):
+        ctrl, fake = _connected_controller(native=False)
+        mavlink, gimbal = self._gimbal_side()
+        fake.reply += gimbal.heartbeat_encode(
+            mavlink.MAV_TYPE_GIMBAL, mavlink.MAV_AUTOPILOT_INVALID, 0, 0, 0
+        ).pack(gimbal)
+        fake.reply += gimbal.command_ack_encode(
+            mavlink.MAV_CMD_REQUEST_MESSAGE, mavlink.MAV_RESULT_ACCEPTED
+        ).pack(gimbal)
+        fake.reply += gimbal.mount_status_encode(1, 191, 500, 0, -4500).pack(gimbal)
+        status = ctrl.get_status()
+        self.assertIsNotNone(status)
+        self.assertEqual((status["pitch"], status["yaw"]), (5.0, -45.0))
+
+    def test_status_discards_stale_input(self):
+        ctrl, fake = _connected_controller(native=False)
+        mavlink, gimbal = self._gimbal_side()
+        fake.rx += gimbal.mount_status_encode(1, 191, 100, 0, 0).pack(gimbal)
+        fake.reply += gimbal.mount_status_encode(1, 191, 200, 0, 0).pack(gimbal)
+        self.assertEqual(ctrl.get_status()["pitch"], 2.0)
+
+    def test_status_without_mount_status_returns_none(self):
+        ctrl, fake = _connected_controller(native=False)
+        mavlink, gimbal = self._gimbal_side()
+        for _ in range(3):
+            fake.reply += gimbal.heartbeat_encode(
+                mavlink.MAV_TYPE_GIMBAL, mavlink.MAV_AUTOPILOT_INVALID, 0, 0, 0
+            ).pack(gimbal)
+        self.assertIsNone(ctrl.get_status())
+        self.assertEqual(len(fake.rx), 0)
+
+    def test_bad_crc_returns_none(self):
+        ctrl, fake = _connected_controller(native=False)
+        fake.reply += _mav2_frame(b'\x00' * 14)
+        self.assertIsNone(ctrl.get_status())
+
+
+class TestStorm32Reconnect(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            from cymbal.camera_gimbal import storm32_controller as mod
+        except ImportError:
+            raise unittest.SkipTest("storm32_controller extension not compiled")
+        self.mod = mod
+        self.ports = []
+
+        def _open(**kwargs):
+            if self.open_error is not None:
+                raise self.open_error
+            port = _FakeSerial(**kwargs)
+            self.ports.append(port)
+            return port
+
+        self.open_error = None
+        patcher = mock.patch.object(mod.serial, 'Serial', _open)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with mock.patch.object(mod, 'mavlink', None):
+            self.ctrl = mod.Storm32Controller(port="/dev/null")
+
+    def test_not_connected_rejects_commands(self):
+        self.assertFalse(self.ctrl.set_angle(0.0, 0.0, 0.0))
+        self.assertEqual(self.ports, [])
+
+    def test_write_error_marks_disconnected(self):
+        self.ctrl.connect()
+        self.ports[0].write_error = self.mod.serial.SerialException("gone")
+        self.assertFalse(self.ctrl.set_angle(0.0, 0.0, 0.0))
+        self.assertFalse(self.ctrl.is_connected())
+        self.assertFalse(self.ports[0].is_open)
+
+    def test_reconnects_lazily_after_write_error(self):
+        self.ctrl.connect()
+        self.ports[0].write_error = self.mod.serial.SerialException("gone")
+        self.ctrl.set_angle(0.0, 0.0, 0.0)
+        self.assertTrue(self.ctrl.set_angle(1.0, 0.0, 0.0))
+        self.assertEqual(len(self.ports), 2)
+        self.assertEqual(len(self.ports[1].tx), 1)
+
+    def test_failed_reconnect_is_throttled(self):
+        self.ctrl.connect()
+        self.ports[0].write_error = self.mod.serial.SerialException("gone")
+        self.ctrl.set_angle(0.0, 0.0, 0.0)
+        self.open_error = self.mod.serial.SerialException("still gone")
+        self.assertFalse(self.ctrl.set_angle(0.0, 0.0, 0.0))
+        # Device is back, but the next attempt is not due yet
+        self.open_error = None
+        self.assertFalse(self.ctrl.set_angle(0.0, 0.0, 0.0))
+        self.assertEqual(len(self.ports), 1)
+
+    def test_disconnect_cancels_reconnect(self):
+        self.ctrl.connect()
+        self.ports[0].write_error = self.mod.serial.SerialException("gone")
+        self.ctrl.set_angle(0.0, 0.0, 0.0)
+        self.ctrl.disconnect()
+        self.assertFalse(self.ctrl.set_angle(0.0, 0.0, 0.0))
+        self.assertEqual(len(self.ports), 1)
+
+
+class _PipeSerial(_FakeSerial):
+    """Fake port whose fileno() is the non-blocking write end of a pipe."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.r_fd, self.w_fd = os.pipe()
+        os.set_blocking(self.w_fd, False)
+        self.unread = b''
+
+    def fileno(self):
+        return self.w_fd
+
+    def fill(self):
+        """Fill the pipe until the kernel refuses more bytes; return the count."""
+        filled = 0
+        try:
+            while True:
+                filled += os.write(self.w_fd, b'\x00' * 4096)
+        except BlockingIOError:
+            pass
+        return filled
+
+    def read_exact(self, size):
+        os.set_blocking(self.r_fd, True)
+        data = bytearray()
+        while len(data) < size:
+            data += os.read(self.r_fd, size - len(data))
+        return bytes(data)
+
+    def break_pipe(self):
+        os.close(self.r_fd)
+        self.r_fd = -1
+
+    def drain(self):
+        os.set_blocking(self.r_fd, False)
+        data = bytearray()
+        try:
+            while True:
+                data += os.read(self.r_fd, 65536)
+        except BlockingIOError:
+            pass
+        return bytes(data)
+
+    def close(self):
+        # Keep what the writer left in the pipe for tests that check it
+        if self.is_open:
+            if self.r_fd >= 0:
+                self.unread = self.drain()
+                os.close(self.r_fd)
+            os.close(self.w_fd)
+        super().close()
+
+
+class TestStorm32RawWrite(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            from cymbal.camera_gimbal import storm32_controller as mod
+        except ImportError:
+            raise unittest.SkipTest("storm32_controller extension not compiled")
+        self.port = _PipeSerial()
+        with mock.patch.object(mod.serial, 'Serial', lambda **kw: self.port):
+            with mock.patch.object(mod, 'mavlink', None):
+                self.ctrl = mod.Storm32Controller(port="/dev/null")
+                self.ctrl.connect()
+        self.addCleanup(self.ctrl.disconnect)
+
+    def _angle_frames(self, *pitches):
+        return b''.join(b'\xFA\x0E' + struct.pack('<3h', p, 0, 0) for p in pitches)
+
+    def test_frames_go_straight_to_fd(self):
+        self.ctrl.set_angle(1.0, 2.0, 3.0)
+        self.assertTrue(self.ctrl.flush())
+        self.assertEqual(self.port.tx, [])
+        self.assertEqual(
+            self.port.drain(), b'\xFA\x0E' + struct.pack('<3h', 100, 200, 300)
+        )
+
+    def test_full_tx_buffer_does_not_block_caller(self):
+        filled = self.port.fill()
+        self.assertTrue(self.ctrl.set_angle(1.0, 0.0, 0.0))
+        self.assertTrue(self.ctrl.set_angle(2.0, 0.0, 0.0))
+        self.assertFalse(self.ctrl.flush(0.1))
+        self.port.read_exact(filled)
+        self.ctrl.set_angle(3.0, 0.0, 0.0)
+        self.assertTrue(self.ctrl.flush())
+        self.assertEqual(self.port.drain(), self._angle_frames(100, 200, 300))
+
+    def test_burst_is_written_in_order(self):
+        for p in range(1, 21):
+            self.ctrl.set_angle(p, 0.0, 0.0)
+        self.assertTrue(self.ctrl.flush())
+        self.assertEqual(
+            self.port.drain(), self._angle_frames(*(p * 100 for p in range(1, 21)))
+        )
+
+    def test_ring_wraparound_keeps_frames_intact(self):
+        sent = []
+        for i in range(300):
+            self.ctrl.set_angle(i % 90, 0.0, 0.0)
+            sent.append((i % 90) * 100)
+            if i % 25 == 24:
+                self.assertTrue(self.ctrl.flush())
+        self.assertTrue(self.ctrl.flush())
+        self.assertEqual(self.port.drain(), self._angle_frames(*sent))
+
+    def test_status_request_is_queued_behind_commands(self):
+        self.port.reply += _mav2_frame(b'\x00' * 4)
+        self.ctrl.set_angle(1.0, 0.0, 0.0)
+        self.ctrl.get_status()
+        self.assertTrue(self.ctrl.flush())
+        self.assertEqual(self.port.drain(), self._angle_frames(100) + b'\xFA\x10')
+
+    def test_stalled_link_is_dropped(self):
+        self.port.fill()
+        for sent in range(40):
+            if not self.ctrl.set_angle(0.0, 0.0, 0.0):
+                break
+        self.assertLess(sent, 40)
+        self.assertFalse(self.ctrl.is_connected())
+
+    def test_writer_error_marks_disconnected(self):
+        self.port.break_pipe()
+        self.assertTrue(self.ctrl.set_angle(1.0, 0.0, 0.0))
+        self.assertFalse(self.ctrl.flush())
+        self.assertFalse(self.ctrl.set_angle(2.0, 0.0, 0.0))
+        self.assertFalse(self.ctrl.is_connected())
+
+    def test_disconnect_sends_queued_commands(self):
+        self.ctrl.set_angle(1.0, 0.0, 0.0)
+        self.ctrl.center()
+        self.ctrl.disconnect()
+        self.assertEqual(self.port.unread, self._angle_frames(100, 0))
+
+    def test_disconnect_stops_writer(self):
+        thread_count = threading.active_count()
+        self.ctrl.disconnect()
+        self.assertEqual(threading.active_count(), thread_count - 1)
+
+if __name__ == '__main__':
+    unittest.main()